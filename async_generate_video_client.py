@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Async Generate Video API client with base64 encoding
+asyncio client for generating videos from images using RunPod's generate_video endpoint
+"""
+
+import os
+import json
+import time
+import base64
+import asyncio
+from typing import Optional, Dict, Any, List
+import logging
+
+import aiohttp
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _read_file_base64(file_path: str) -> str:
+    with open(file_path, 'rb') as f:
+        return base64.b64encode(f.read()).decode('utf-8')
+
+
+def _write_file_base64(file_path: str, base64_data: str) -> int:
+    decoded = base64.b64decode(base64_data)
+    with open(file_path, 'wb') as f:
+        f.write(decoded)
+    return len(decoded)
+
+
+class AsyncGenerateVideoClient:
+    def __init__(
+        self,
+        runpod_endpoint_id: str,
+        runpod_api_key: str,
+        api_base: str = "https://api.runpod.ai/v2",
+        max_connections: int = 100
+    ):
+        """
+        Initialize async Generate Video client
+
+        The HTTP session is created lazily inside the running event loop.
+        Use `async with AsyncGenerateVideoClient(...) as client:` or call `close()` when done.
+
+        Args:
+            runpod_endpoint_id: RunPod endpoint ID
+            runpod_api_key: RunPod API key
+            api_base: RunPod API base URL (override to target a local/fake endpoint)
+            max_connections: Maximum pooled HTTP connections shared by all jobs
+        """
+        self.runpod_endpoint_id = runpod_endpoint_id
+        self.runpod_api_key = runpod_api_key
+        self.api_base = api_base.rstrip('/')
+        self.runpod_api_endpoint = f"{self.api_base}/{runpod_endpoint_id}/run"
+        self.status_url = f"{self.api_base}/{runpod_endpoint_id}/status"
+        self.health_url = f"{self.api_base}/{runpod_endpoint_id}/health"
+        self.cancel_url = f"{self.api_base}/{runpod_endpoint_id}/cancel"
+        self.max_connections = max_connections
+
+        self.session: Optional[aiohttp.ClientSession] = None
+
+        logger.info(f"AsyncGenerateVideoClient initialized - Endpoint: {runpod_endpoint_id}")
+
+    async def __aenter__(self) -> "AsyncGenerateVideoClient":
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers={
+                    'Authorization': f'Bearer {self.runpod_api_key}',
+                    'Content-Type': 'application/json'
+                },
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                # Like requests' timeout=30: limit connect and each socket read, not the whole
+                # request, so large COMPLETED /status bodies (base64 video) can finish downloading
+                timeout=aiohttp.ClientTimeout(total=None, connect=30, sock_read=30)
+            )
+        return self.session
+
+    async def close(self):
+        """
+        Close the pooled HTTP session
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def encode_file_to_base64(self, file_path: str) -> Optional[str]:
+        """
+        Encode file to base64 without blocking the event loop
+
+        Args:
+            file_path: File path to encode
+
+        Returns:
+            Base64 encoded string or None (on failure)
+        """
+        try:
+            if not os.path.exists(file_path):
+                logger.error(f"File does not exist: {file_path}")
+                return None
+
+            base64_data = await asyncio.to_thread(_read_file_base64, file_path)
+
+            logger.info(f"✅ File base64 encoding completed: {file_path}")
+            return base64_data
+
+        except Exception as e:
+            logger.error(f"❌ File base64 encoding failed: {e}")
+            return None
+
+    async def submit_job(self, input_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Submit job to RunPod
+
+        Args:
+            input_data: API input data
+
+        Returns:
+            Job ID or None (on failure)
+        """
+        payload = {"input": input_data}
+
+        try:
+            logger.info(f"Submitting job to RunPod: {self.runpod_api_endpoint}")
+            logger.debug(f"Input data: {json.dumps(input_data, indent=2, ensure_ascii=False)}")
+
+            async with self._get_session().post(self.runpod_api_endpoint, json=payload) as response:
+                response.raise_for_status()
+                response_data = await response.json(content_type=None)
+
+            job_id = response_data.get('id')
+
+            if job_id:
+                logger.info(f"✅ Job submission successful! Job ID: {job_id}")
+                return job_id
+            else:
+                logger.error(f"❌ Failed to receive Job ID: {response_data}")
+                return None
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ Job submission failed: {e}")
+            return None
+
+    async def get_health(self) -> Optional[Dict[str, Any]]:
+        """
+        Get endpoint health (worker counts and queue depth)
+
+        Returns:
+            Health dictionary ({'jobs': {...}, 'workers': {...}}) or None (on failure)
+        """
+        try:
+            async with self._get_session().get(self.health_url) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"❌ Health check failed ({self.runpod_endpoint_id}): {e}")
+            return None
+
+    async def cancel_job(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Cancel request success status
+        """
+        try:
+            async with self._get_session().post(f"{self.cancel_url}/{job_id}") as response:
+                response.raise_for_status()
+            logger.info(f"🛑 Job cancelled: {job_id}")
+            return True
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ Job cancel failed: {e}")
+            return False
+
+    async def wait_for_completion(
+        self,
+        job_id: str,
+        check_interval: int = 10,
+        max_wait_time: int = 1800,
+        cancel_on_exit: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Wait for job completion
+
+        If the waiting task is cancelled, the RunPod job is cancelled too
+        (when cancel_on_exit is set) and CancelledError is re-raised.
+
+        Args:
+            job_id: Job ID
+            check_interval: Status check interval (seconds)
+            max_wait_time: Maximum wait time (seconds)
+            cancel_on_exit: Cancel the RunPod job when this wait is cancelled
+
+        Returns:
+            Job result dictionary
+        """
+        start_time = time.monotonic()
+
+        try:
+            while time.monotonic() - start_time < max_wait_time:
+                try:
+                    logger.debug(f"⏱️ Checking job status... (Job ID: {job_id})")
+
+                    async with self._get_session().get(f"{self.status_url}/{job_id}") as response:
+                        response.raise_for_status()
+                        status_data = await response.json(content_type=None)
+
+                    status = status_data.get('status')
+
+                    if status == 'COMPLETED':
+                        logger.info(f"✅ Job completed! (Job ID: {job_id})")
+                        return {
+                            'status': 'COMPLETED',
+                            'output': status_data.get('output'),
+                            'job_id': job_id,
+                            'delay_time': status_data.get('delayTime'),
+                            'execution_time': status_data.get('executionTime')
+                        }
+                    elif status == 'FAILED':
+                        logger.error(f"❌ Job failed. (Job ID: {job_id})")
+                        return {
+                            'status': 'FAILED',
+                            'error': status_data.get('error', 'Unknown error'),
+                            'job_id': job_id
+                        }
+                    elif status in ['IN_QUEUE', 'IN_PROGRESS']:
+                        logger.debug(f"🏃 Job in progress... (Status: {status})")
+                    else:
+                        logger.warning(f"❓ Unknown status: {status}")
+                        return {
+                            'status': 'UNKNOWN',
+                            'data': status_data,
+                            'job_id': job_id
+                        }
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.error(f"❌ Status check error: {e}")
+
+                await asyncio.sleep(check_interval)
+        except asyncio.CancelledError:
+            if cancel_on_exit:
+                # Shield so the cancel request still goes out while this task unwinds
+                try:
+                    await asyncio.shield(self.cancel_job(job_id))
+                except asyncio.CancelledError:
+                    pass
+            raise
+
+        logger.error(f"❌ Job wait timeout ({max_wait_time} seconds)")
+        return {
+            'status': 'TIMEOUT',
+            'job_id': job_id
+        }
+
+    async def save_video_result(self, result: Dict[str, Any], output_path: str) -> bool:
+        """
+        Save video file from job result without blocking the event loop
+
+        Args:
+            result: Job result dictionary
+            output_path: File path to save
+
+        Returns:
+            Save success status
+        """
+        try:
+            if result.get('status') != 'COMPLETED':
+                logger.error(f"Job not completed: {result.get('status')}")
+                return False
+
+            output = result.get('output') or {}
+            video_b64 = output.get('video')
+
+            if not video_b64:
+                logger.error("Video data not found")
+                return False
+
+            # Create directory
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+            # Decode base64 and save video off the event loop
+            file_size = await asyncio.to_thread(_write_file_base64, output_path, video_b64)
+
+            logger.info(f"✅ Video saved successfully: {output_path} ({file_size / (1024*1024):.1f}MB)")
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Video save failed: {e}")
+            return False
+
+    async def create_video_from_image(
+        self,
+        image_path: str,
+        prompt: str = "running man, grab the gun",
+        negative_prompt: Optional[str] = None,
+        width: int = 480,
+        height: int = 832,
+        length: int = 81,
+        steps: int = 10,
+        seed: int = 42,
+        cfg: float = 2.0,
+        context_overlap: int = 48,
+        lora_pairs: Optional[List[Dict[str, Any]]] = None,
+        interpolation_factor: int = 1,
+        check_interval: int = 10,
+        max_wait_time: int = 1800
+    ) -> Dict[str, Any]:
+        """
+        Generate video from image
+
+        Args:
+            image_path: Image file path
+            prompt: Prompt text
+            negative_prompt: Negative prompt to exclude unwanted elements
+            width: Output width
+            height: Output height
+            length: Number of frames
+            steps: Number of steps
+            seed: Seed value
+            cfg: CFG scale
+            context_overlap: Context overlap
+            lora_pairs: LoRA settings list (max 4)
+            interpolation_factor: Generate length/factor frames and interpolate back on CPU (1 = off)
+            check_interval: Status check interval (seconds)
+            max_wait_time: Maximum wait time (seconds)
+
+        Returns:
+            Job result dictionary
+        """
+        # Check file existence
+        if not os.path.exists(image_path):
+            return {"error": f"Image file does not exist: {image_path}"}
+
+        # Encode image to base64
+        image_base64 = await self.encode_file_to_base64(image_path)
+        if not image_base64:
+            return {"error": "Image base64 encoding failed"}
+
+        # Process LoRA settings
+        if lora_pairs is None:
+            lora_pairs = []
+
+        # Support up to 4 LoRAs
+        if len(lora_pairs) > 4:
+            logger.warning(f"LoRA count is {len(lora_pairs)}. Only up to 4 LoRAs are supported. Using first 4 only.")
+            lora_pairs = lora_pairs[:4]
+
+        # Configure API input data
+        input_data = {
+            "image_base64": image_base64,
+            "prompt": prompt,
+            "width": width,
+            "height": height,
+            "length": length,
+            "steps": steps,
+            "seed": seed,
+            "cfg": cfg,
+            "context_overlap": context_overlap,
+            "lora_pairs": lora_pairs
+        }
+
+        # Add negative_prompt if provided
+        if negative_prompt:
+            input_data["negative_prompt"] = negative_prompt
+
+        # Add frame interpolation if requested
+        if interpolation_factor > 1:
+            input_data["interpolation_factor"] = interpolation_factor
+
+        # The encoded image is only needed for submission
+        del image_base64
+
+        # Submit job and wait
+        job_id = await self.submit_job(input_data)
+        del input_data
+        if not job_id:
+            return {"error": "Job submission failed"}
+
+        return await self.wait_for_completion(job_id, check_interval, max_wait_time)
+
+    async def batch_process_images(
+        self,
+        image_folder_path: str,
+        output_folder_path: str,
+        valid_extensions: tuple = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff'),
+        prompt: str = "running man, grab the gun",
+        negative_prompt: Optional[str] = None,
+        width: int = 480,
+        height: int = 832,
+        length: int = 81,
+        steps: int = 10,
+        seed: int = 42,
+        cfg: float = 2.0,
+        context_overlap: int = 48,
+        lora_pairs: Optional[List[Dict[str, Any]]] = None,
+        interpolation_factor: int = 1,
+        max_concurrency: int = 32
+    ) -> Dict[str, Any]:
+        """
+        Batch process all image files in folder concurrently
+
+        Args:
+            image_folder_path: Folder path containing image files
+            output_folder_path: Folder path to save results
+            valid_extensions: Image file extensions to process
+            prompt: Prompt text
+            negative_prompt: Negative prompt to exclude unwanted elements
+            width: Output width
+            height: Output height
+            length: Number of frames
+            steps: Number of steps
+            seed: Seed value
+            cfg: CFG scale
+            context_overlap: Context overlap
+            lora_pairs: LoRA settings list
+            interpolation_factor: Frame interpolation factor (1 = off)
+            max_concurrency: Maximum number of jobs in flight at once
+
+        Returns:
+            Batch processing result dictionary
+        """
+        # Check path
+        if not os.path.isdir(image_folder_path):
+            return {"error": f"Image folder does not exist: {image_folder_path}"}
+
+        # Create output folder
+        os.makedirs(output_folder_path, exist_ok=True)
+
+        # Get image file list
+        image_files = [
+            f for f in os.listdir(image_folder_path)
+            if f.lower().endswith(valid_extensions)
+        ]
+
+        if not image_files:
+            return {"error": f"No image files to process: {image_folder_path}"}
+
+        logger.info(f"Starting batch processing: {len(image_files)} files (concurrency {max_concurrency})")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def process_one(filename: str) -> Dict[str, Any]:
+            async with semaphore:
+                image_path = os.path.join(image_folder_path, filename)
+
+                # Generate video
+                result = await self.create_video_from_image(
+                    image_path=image_path,
+                    prompt=prompt,
+                    negative_prompt=negative_prompt,
+                    width=width,
+                    height=height,
+                    length=length,
+                    steps=steps,
+                    seed=seed,
+                    cfg=cfg,
+                    context_overlap=context_overlap,
+                    lora_pairs=lora_pairs,
+                    interpolation_factor=interpolation_factor
+                )
+
+                if result.get('status') != 'COMPLETED':
+                    logger.error(f"[{filename}] Job failed: {result.get('error', 'Unknown error')}")
+                    return {
+                        "filename": filename,
+                        "status": "failed",
+                        "error": result.get('error', 'Unknown error'),
+                        "job_id": result.get('job_id')
+                    }
+
+                # Save result file
+                base_filename = os.path.splitext(filename)[0]
+                output_filename = os.path.join(output_folder_path, f"result_{base_filename}.mp4")
+
+                if await self.save_video_result(result, output_filename):
+                    logger.info(f"✅ [{filename}] Processing completed")
+                    return {
+                        "filename": filename,
+                        "status": "success",
+                        "output_file": output_filename,
+                        "job_id": result.get('job_id')
+                    }
+
+                logger.error(f"[{filename}] Result save failed")
+                return {
+                    "filename": filename,
+                    "status": "failed",
+                    "error": "Result save failed",
+                    "job_id": result.get('job_id')
+                }
+
+        file_results = await asyncio.gather(*(process_one(filename) for filename in image_files))
+
+        results = {
+            "total_files": len(image_files),
+            "successful": sum(1 for r in file_results if r["status"] == "success"),
+            "failed": sum(1 for r in file_results if r["status"] == "failed"),
+            "results": list(file_results)
+        }
+
+        logger.info(f"🎉 Batch processing completed: {results['successful']}/{results['total_files']} successful")
+        return results
+
+
+async def main():
+    """Usage example"""
+
+    # Configuration (change to actual values)
+    ENDPOINT_ID = "your-endpoint-id"
+    RUNPOD_API_KEY = "your-runpod-api-key"
+
+    async with AsyncGenerateVideoClient(
+        runpod_endpoint_id=ENDPOINT_ID,
+        runpod_api_key=RUNPOD_API_KEY
+    ) as client:
+        result = await client.create_video_from_image(
+            image_path="./example_image.png",
+            prompt="running man, grab the gun",
+            negative_prompt="blurry, low quality, distorted",
+            width=480,
+            height=832,
+            length=81,
+            steps=10,
+            seed=42,
+            cfg=2.0
+        )
+
+        if result.get('status') == 'COMPLETED':
+            await client.save_video_result(result, "./output_async.mp4")
+        else:
+            print(f"Error: {result.get('error')}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Fake RunPod serverless endpoints
+Local stand-in for the RunPod /run, /status, /health and /cancel API with configurable queue behavior
+"""
+
+import json
+import uuid
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, Any
+import logging
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FakeEndpointConfig:
+    """Queue behavior of a single fake endpoint (attributes may be changed while running)"""
+
+    def __init__(
+        self,
+        in_queue: int = 0,
+        idle: int = 1,
+        running: int = 0,
+        fail_submit: bool = False,
+        polls_until_complete: int = 0,
+        delay_time_ms: int = 1000,
+        execution_time_ms: int = 10000,
+        output: Optional[Dict[str, Any]] = None,
+        final_status: str = "COMPLETED",
+        error: str = "Fake job failure"
+    ):
+        """
+        Args:
+            in_queue: `jobs.inQueue` reported by /health
+            idle: `workers.idle` reported by /health
+            running: `workers.running` reported by /health
+            fail_submit: Answer /run with HTTP 500
+            polls_until_complete: /status answers IN_QUEUE this many times before COMPLETED
+            delay_time_ms: `delayTime` reported for completed jobs
+            execution_time_ms: `executionTime` reported for completed jobs
+            output: Job output for completed jobs
+            final_status: Status reported after the queued polls (COMPLETED or FAILED)
+            error: `error` reported for FAILED jobs
+        """
+        self.in_queue = in_queue
+        self.idle = idle
+        self.running = running
+        self.fail_submit = fail_submit
+        self.polls_until_complete = polls_until_complete
+        self.delay_time_ms = delay_time_ms
+        self.execution_time_ms = execution_time_ms
+        self.output = output if output is not None else {"video": ""}
+        self.final_status = final_status
+        self.error = error
+
+
+class FakeRunPodServer:
+    """
+    Serves several fake endpoints on one local port
+
+    Routes: POST /<endpoint_id>/run, GET /<endpoint_id>/status/<job_id>,
+    GET /<endpoint_id>/health, POST /<endpoint_id>/cancel/<job_id>
+    """
+
+    def __init__(self, endpoints: Dict[str, FakeEndpointConfig], host: str = "127.0.0.1", port: int = 0):
+        self.endpoints = endpoints
+        self.host = host
+        self.port = port
+
+        # job_id -> {'endpoint_id', 'input', 'polls', 'cancelled'}
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.submissions: Dict[str, int] = {endpoint_id: 0 for endpoint_id in endpoints}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def api_base(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "FakeRunPodServer":
+        fake = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, data, code=200):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _route(self):
+                parts = self.path.strip('/').split('/')
+                config = fake.endpoints.get(parts[0])
+                return parts, config
+
+            def do_GET(self):
+                parts, config = self._route()
+                if config is None or len(parts) < 2:
+                    self._send_json({"error": "not found"}, 404)
+                elif parts[1] == 'health':
+                    self._send_json({
+                        "jobs": {"inQueue": config.in_queue, "inProgress": config.running},
+                        "workers": {"idle": config.idle, "running": config.running}
+                    })
+                elif parts[1] == 'status' and len(parts) == 3:
+                    self._send_json(fake._status(parts[2], config))
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+            def do_POST(self):
+                parts, config = self._route()
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                if config is None or len(parts) < 2:
+                    self._send_json({"error": "not found"}, 404)
+                elif parts[1] == 'run':
+                    if config.fail_submit:
+                        self._send_json({"error": "submission failed"}, 500)
+                        return
+                    job_id = f"{parts[0]}-{uuid.uuid4()}"
+                    with fake._lock:
+                        fake.submissions[parts[0]] += 1
+                        fake.jobs[job_id] = {
+                            "endpoint_id": parts[0],
+                            "input": json.loads(body or b'{}').get('input'),
+                            "polls": 0,
+                            "cancelled": False
+                        }
+                    self._send_json({"id": job_id, "status": "IN_QUEUE"})
+                elif parts[1] == 'cancel' and len(parts) == 3:
+                    with fake._lock:
+                        if parts[2] in fake.jobs:
+                            fake.jobs[parts[2]]["cancelled"] = True
+                    self._send_json({"id": parts[2], "status": "CANCELLED"})
+                else:
+                    self._send_json({"error": "not found"}, 404)
+
+        self._server = ThreadingHTTPServer((self.host, self.port), RequestHandler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Fake RunPod endpoints listening on {self.api_base}: {', '.join(self.endpoints)}")
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _status(self, job_id: str, config: FakeEndpointConfig) -> Dict[str, Any]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return {"id": job_id, "status": "UNKNOWN"}
+            if job["cancelled"]:
+                return {"id": job_id, "status": "CANCELLED"}
+            job["polls"] += 1
+            if job["polls"] <= config.polls_until_complete:
+                return {"id": job_id, "status": "IN_QUEUE"}
+        if config.final_status == "FAILED":
+            return {"id": job_id, "status": "FAILED", "error": config.error}
+        return {
+            "id": job_id,
+            "status": "COMPLETED",
+            "output": config.output,
+            "delayTime": config.delay_time_ms,
+            "executionTime": config.execution_time_ms
+        }
+
+
+def main():
+    """Run two fake endpoints until interrupted"""
+    import time
+
+    server = FakeRunPodServer({
+        "fake-busy": FakeEndpointConfig(in_queue=20, idle=0, running=2),
+        "fake-idle": FakeEndpointConfig(in_queue=0, idle=2, running=0),
+    }, port=8000).start()
+    print(f"api_base={server.api_base}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
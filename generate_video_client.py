@@ -20,7 +20,8 @@ class GenerateVideoClient:
     def __init__(
         self,
         runpod_endpoint_id: str,
-        runpod_api_key: str
+        runpod_api_key: str,
+        api_base: str = "https://api.runpod.ai/v2"
     ):
         """
         Initialize Generate Video client
@@ -28,11 +29,14 @@ class GenerateVideoClient:
         Args:
             runpod_endpoint_id: RunPod endpoint ID
             runpod_api_key: RunPod API key
+            api_base: RunPod API base URL (override to target a local/fake endpoint)
         """
         self.runpod_endpoint_id = runpod_endpoint_id
         self.runpod_api_key = runpod_api_key
-        self.runpod_api_endpoint = f"https://api.runpod.ai/v2/{runpod_endpoint_id}/run"
-        self.status_url = f"https://api.runpod.ai/v2/{runpod_endpoint_id}/status"
+        self.api_base = api_base.rstrip('/')
+        self.runpod_api_endpoint = f"{self.api_base}/{runpod_endpoint_id}/run"
+        self.status_url = f"{self.api_base}/{runpod_endpoint_id}/status"
+        self.health_url = f"{self.api_base}/{runpod_endpoint_id}/health"
         
         # Initialize HTTP session
         self.session = requests.Session()
@@ -102,6 +106,21 @@ class GenerateVideoClient:
             logger.error(f"❌ Job submission failed: {e}")
             return None
     
+    def get_health(self) -> Optional[Dict[str, Any]]:
+        """
+        Get endpoint health (worker counts and queue depth)
+        
+        Returns:
+            Health dictionary ({'jobs': {...}, 'workers': {...}}) or None (on failure)
+        """
+        try:
+            response = self.session.get(self.health_url, timeout=10)
+            response.raise_for_status()
+            return response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"❌ Health check failed ({self.runpod_endpoint_id}): {e}")
+            return None
+    
     def wait_for_completion(self, job_id: str, check_interval: int = 10, max_wait_time: int = 1800) -> Dict[str, Any]:
         """
         Wait for job completion
@@ -131,7 +150,9 @@ class GenerateVideoClient:
                     return {
                         'status': 'COMPLETED',
                         'output': status_data.get('output'),
-                        'job_id': job_id
+                        'job_id': job_id,
+                        'delay_time': status_data.get('delayTime'),
+                        'execution_time': status_data.get('executionTime')
                     }
                 elif status == 'FAILED':
                     logger.error("❌ Job failed.")
@@ -213,7 +234,8 @@ class GenerateVideoClient:
         seed: int = 42,
         cfg: float = 2.0,
         context_overlap: int = 48,
-        lora_pairs: Optional[List[Dict[str, Any]]] = None
+        lora_pairs: Optional[List[Dict[str, Any]]] = None,
+        interpolation_factor: int = 1
     ) -> Dict[str, Any]:
         """
         Generate video from image
@@ -230,6 +252,7 @@ class GenerateVideoClient:
             cfg: CFG scale
             context_overlap: Context overlap
             lora_pairs: LoRA settings list (max 4)
+            interpolation_factor: Generate length/factor frames and interpolate back on CPU (1 = off)
         
         Returns:
             Job result dictionary
@@ -271,6 +294,10 @@ class GenerateVideoClient:
         if negative_prompt:
             input_data["negative_prompt"] = negative_prompt
         
+        # Add frame interpolation if requested
+        if interpolation_factor > 1:
+            input_data["interpolation_factor"] = interpolation_factor
+        
         # Submit job and wait
         job_id = self.submit_job(input_data)
         if not job_id:
@@ -293,7 +320,8 @@ class GenerateVideoClient:
         seed: int = 42,
         cfg: float = 2.0,
         context_overlap: int = 48,
-        lora_pairs: Optional[List[Dict[str, Any]]] = None
+        lora_pairs: Optional[List[Dict[str, Any]]] = None,
+        interpolation_factor: int = 1
     ) -> Dict[str, Any]:
         """
         Batch process all image files in folder
@@ -312,6 +340,7 @@ class GenerateVideoClient:
             cfg: CFG scale
             context_overlap: Context overlap
             lora_pairs: LoRA settings list
+            interpolation_factor: Frame interpolation factor (1 = off)
         
         Returns:
             Batch processing result dictionary
@@ -359,7 +388,8 @@ class GenerateVideoClient:
                 seed=seed,
                 cfg=cfg,
                 context_overlap=context_overlap,
-                lora_pairs=lora_pairs
+                lora_pairs=lora_pairs,
+                interpolation_factor=interpolation_factor
             )
             
             if result.get('status') == 'COMPLETED':
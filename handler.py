@@ -11,6 +11,9 @@ import urllib.parse
 import binascii # Base64 에러 처리를 위해 import
 import subprocess
 import time
+from workspace import WorkspaceManager
+import interpolation
+from job_recorder import JobRecorder
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,6 +21,12 @@ logger = logging.getLogger(__name__)
 
 server_address = os.getenv('SERVER_ADDRESS', '127.0.0.1')
 client_id = str(uuid.uuid4())
+# 작업별 스크래치 디렉토리와 ComfyUI 출력 파일 관리
+workspace = WorkspaceManager.from_env()
+# RECORD_JOBS_PATH가 설정되면 정제된 작업 입력을 JSONL로 기록 (replay.py에서 재생)
+recorder = JobRecorder.from_env()
+# 워크플로우 JSON 파일 위치
+workflow_dir = os.getenv('WORKFLOW_DIR', '/')
 def to_nearest_multiple_of_16(value):
     """주어진 값을 가장 가까운 16의 배수로 보정, 최소 16 보장"""
     try:
@@ -28,6 +37,21 @@ def to_nearest_multiple_of_16(value):
     if adjusted < 16:
         adjusted = 16
     return adjusted
+def to_int(value):
+    """정수로 해석되는 값(정수, 정수값 float, 정수 문자열)이면 int를, 아니면 None을 반환"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
 def process_input(input_data, temp_dir, output_filename, input_type):
     """입력 데이터를 처리하여 파일 경로를 반환하는 함수"""
     if input_type == "path":
@@ -112,7 +136,12 @@ def get_history(prompt_id):
     with urllib.request.urlopen(url) as response:
         return json.loads(response.read())
 
-def get_videos(ws, prompt):
+def get_videos(ws, prompt, postprocess=None, preview_callbacks=None, node_seconds=None):
+    preview_callbacks = preview_callbacks or {}
+    # node_seconds가 주어지면 노드별 실행 시간(executing 메시지 간격)을 누적
+    node_seconds = node_seconds if node_seconds is not None else {}
+    current_node = None
+    current_start = None
     prompt_id = queue_prompt(prompt)['prompt_id']
     output_videos = {}
     while True:
@@ -121,21 +150,41 @@ def get_videos(ws, prompt):
             message = json.loads(out)
             if message['type'] == 'executing':
                 data = message['data']
+                if data.get('prompt_id') == prompt_id:
+                    now = time.time()
+                    if current_node is not None:
+                        node_seconds[current_node] = node_seconds.get(current_node, 0.0) + now - current_start
+                    current_node, current_start = data['node'], now
                 if data['node'] is None and data['prompt_id'] == prompt_id:
                     break
+            elif message['type'] == 'executed':
+                # 프리뷰 노드 출력은 나머지 파이프라인이 끝나기 전에 바로 전달
+                data = message['data']
+                if data['prompt_id'] == prompt_id and data['node'] in preview_callbacks:
+                    # 콜백 처리 시간이 노드 실행 시간에 섞이지 않도록 여기서 구간을 닫음
+                    if current_node == data['node']:
+                        node_seconds[current_node] = node_seconds.get(current_node, 0.0) + time.time() - current_start
+                        current_node = None
+                    preview_callbacks[data['node']](data['output'])
         else:
             continue
 
     history = get_history(prompt_id)[prompt_id]
     for node_id in history['outputs']:
+        if node_id in preview_callbacks:
+            continue
         node_output = history['outputs'][node_id]
         videos_output = []
         if 'gifs' in node_output:
             for video in node_output['gifs']:
+                # 후처리(프레임 보간 등)가 있으면 결과 파일 경로로 교체
+                video_path = postprocess(video['fullpath']) if postprocess else video['fullpath']
                 # fullpath를 이용하여 직접 파일을 읽고 base64로 인코딩
-                with open(video['fullpath'], 'rb') as f:
+                with open(video_path, 'rb') as f:
                     video_data = base64.b64encode(f.read()).decode('utf-8')
                 videos_output.append(video_data)
+                # 메모리로 읽은 출력 파일은 바로 삭제
+                workspace.remove_output(video['fullpath'])
         output_videos[node_id] = videos_output
 
     return output_videos
@@ -144,14 +193,91 @@ def load_workflow(workflow_path):
     with open(workflow_path, 'r') as file:
         return json.load(file)
 
+# 1단계(HIGH, 220번) 샘플러 결과를 디코딩/인코딩하는 프리뷰 노드 ID
+PREVIEW_DECODE_NODE_ID = "900"
+PREVIEW_SCALE_NODE_ID = "901"
+PREVIEW_COMBINE_NODE_ID = "902"
+PREVIEW_NODE_IDS = (PREVIEW_DECODE_NODE_ID, PREVIEW_SCALE_NODE_ID, PREVIEW_COMBINE_NODE_ID)
+# progress update로 보낼 프리뷰 최대 크기 (runpod SDK가 DEBUG 레벨에서 payload 전체를 로그에 남김)
+PREVIEW_MAX_BYTES = int(float(os.getenv('PREVIEW_MAX_MB', 1)) * 1024 * 1024)
+
+def upstream_nodes(prompt, node_id):
+    """node_id와 입력 링크로 연결된 모든 상위 노드 ID 집합을 반환"""
+    nodes = set()
+    stack = [node_id]
+    while stack:
+        current = stack.pop()
+        if current in nodes or current not in prompt:
+            continue
+        nodes.add(current)
+        for value in prompt[current]["inputs"].values():
+            if isinstance(value, list) and len(value) == 2 and isinstance(value[0], str):
+                stack.append(value[0])
+    return nodes
+
+def build_preview_prompt(prompt, scale, crf):
+    """1단계 샘플러(220번)까지만 실행하고 그 출력을 타일 VAE로 디코딩/축소해 저화질 프리뷰로 인코딩하는 프롬프트를 반환
+
+    본 프롬프트보다 먼저 실행해 LOW 단계 전에 프리뷰가 나오도록 하고,
+    본 프롬프트는 ComfyUI 캐시에 남은 220번 출력을 재사용함 (본 프롬프트는 변경하지 않음)
+    """
+    prompt = dict(prompt)
+    decode_inputs = dict(prompt["612"]["inputs"])
+    decode_inputs["enable_vae_tiling"] = True
+    decode_inputs["samples"] = ["220", 0]
+    prompt[PREVIEW_DECODE_NODE_ID] = {"class_type": "WanVideoDecode", "inputs": decode_inputs}
+
+    prompt[PREVIEW_SCALE_NODE_ID] = {
+        "class_type": "ImageScaleBy",
+        "inputs": {"upscale_method": "bilinear", "scale_by": scale, "image": [PREVIEW_DECODE_NODE_ID, 0]},
+    }
+
+    combine_inputs = dict(prompt["131"]["inputs"])
+    combine_inputs["filename_prefix"] = "WanVideo_preview"
+    combine_inputs["crf"] = crf
+    combine_inputs["save_metadata"] = False
+    combine_inputs["images"] = [PREVIEW_SCALE_NODE_ID, 0]
+    prompt[PREVIEW_COMBINE_NODE_ID] = {"class_type": "VHS_VideoCombine", "inputs": combine_inputs}
+    return {node_id: prompt[node_id] for node_id in upstream_nodes(prompt, PREVIEW_COMBINE_NODE_ID)}
+
 def handler(job):
-    job_input = job.get("input", {})
+    return process_job(job.get("input", {}), job)
 
+def process_job(job_input, job=None):
+    """작업 입력을 처리 (job이 None이면 RunPod progress update를 보내지 않음)"""
     logger.info(f"Received job input: {job_input}")
-    task_id = f"task_{uuid.uuid4()}"
+
+    # 거부/실패한 작업도 재생 시 오류 분포에 포함되도록 결과와 함께 기록
+    resolved_paths = {}
+
+    # 디스크 여유 공간이 부족하면 작업 시작 전에 거부
+    space_error = workspace.check_free_space()
+    if space_error:
+        recorder.record(job_input, resolved_paths, space_error)
+        return {"error": space_error}
+
+    task_id = workspace.create_job_dir()
+    error = None
+    try:
+        result = run_job(job_input, task_id, job, resolved_paths)
+        error = result.get("error")
+        return result
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        # 입력 파일 해시를 계산해야 하므로 작업 디렉토리 삭제 전에 기록
+        recorder.record(job_input, resolved_paths, error)
+        workspace.release_job_dir(task_id)
+
+def run_job(job_input, task_id, job=None, resolved_paths=None):
+    job_start_time = time.time()
+    # 해석된 입력 파일 경로 (None으로 남아 있으면 해석 실패)
+    resolved_paths = resolved_paths if resolved_paths is not None else {}
 
     # 이미지 입력 처리 (image_path, image_url, image_base64 중 하나만 사용)
     image_path = None
+    resolved_paths["image"] = None
     if "image_path" in job_input:
         image_path = process_input(job_input["image_path"], task_id, "input_image.jpg", "path")
     elif "image_url" in job_input:
@@ -163,15 +289,19 @@ def handler(job):
         image_path = "/example_image.png"
         logger.info("기본 이미지 파일을 사용합니다: /example_image.png")
 
+    resolved_paths["image"] = image_path
+
     # 엔드 이미지 입력 처리 (end_image_path, end_image_url, end_image_base64 중 하나만 사용)
     end_image_path_local = None
+    resolved_paths["end_image"] = None
     if "end_image_path" in job_input:
         end_image_path_local = process_input(job_input["end_image_path"], task_id, "end_image.jpg", "path")
     elif "end_image_url" in job_input:
         end_image_path_local = process_input(job_input["end_image_url"], task_id, "end_image.jpg", "url")
     elif "end_image_base64" in job_input:
         end_image_path_local = process_input(job_input["end_image_base64"], task_id, "end_image.jpg", "base64")
-    
+    resolved_paths["end_image"] = end_image_path_local
+
     # LoRA 설정 확인 - 배열로 받아서 처리
     lora_pairs = job_input.get("lora_pairs", [])
     
@@ -182,7 +312,7 @@ def handler(job):
         lora_pairs = lora_pairs[:4]
     
     # 워크플로우 파일 선택 (end_image_*가 있으면 FLF2V 워크플로 사용)
-    workflow_file = "/new_Wan22_flf2v_api.json" if end_image_path_local else "/new_Wan22_api.json"
+    workflow_file = os.path.join(workflow_dir, "new_Wan22_flf2v_api.json" if end_image_path_local else "new_Wan22_api.json")
     logger.info(f"Using {'FLF2V' if end_image_path_local else 'single'} workflow with {lora_count} LoRA pairs")
     
     prompt = load_workflow(workflow_file)
@@ -190,8 +320,33 @@ def handler(job):
     length = job_input.get("length", 81)
     steps = job_input.get("steps", 10)
 
+    # 프레임 보간 모드: 줄어든 프레임 수로 생성한 뒤 CPU에서 요청 길이/프레임레이트로 보간
+    interpolation_factor = to_int(job_input.get("interpolation_factor", 1))
+    if interpolation_factor is None:
+        return {"error": f"interpolation_factor 값이 정수가 아닙니다: {job_input.get('interpolation_factor')}"}
+    if interpolation_factor < 1:
+        return {"error": f"interpolation_factor는 1 이상이어야 합니다: {interpolation_factor}"}
+
+    # 프리뷰 파라미터 검증 (잘못된 값이 ComfyUI 프롬프트 검증에서 작업 전체를 실패시키지 않도록 미리 확인)
+    preview = job_input.get("preview", False)
+    if not isinstance(preview, bool):
+        return {"error": f"preview 값은 true/false여야 합니다: {preview}"}
+    preview_scale = job_input.get("preview_scale", 0.5)
+    preview_crf = to_int(job_input.get("preview_crf", 32))
+    if preview:
+        if isinstance(preview_scale, bool) or not isinstance(preview_scale, (int, float)) or not 0 < preview_scale <= 1:
+            return {"error": f"preview_scale은 0보다 크고 1 이하인 숫자여야 합니다: {preview_scale}"}
+        if preview_crf is None or not 0 <= preview_crf <= 51:
+            return {"error": f"preview_crf는 0~51 범위의 정수여야 합니다: {job_input.get('preview_crf')}"}
+    frame_rate = prompt["131"]["inputs"]["frame_rate"]
+    generated_length = interpolation.reduced_frame_count(length, interpolation_factor)
+    if generated_length != length:
+        # 생성 영상의 재생 시간이 최종 영상과 같도록 인코딩 프레임레이트를 낮춤
+        prompt["131"]["inputs"]["frame_rate"] = frame_rate * (generated_length - 1) / (length - 1)
+        logger.info(f"Frame interpolation enabled: generating {generated_length} frames, interpolating to {length} frames @ {frame_rate}fps")
+
     prompt["244"]["inputs"]["image"] = image_path
-    prompt["541"]["inputs"]["num_frames"] = length
+    prompt["541"]["inputs"]["num_frames"] = generated_length
     prompt["135"]["inputs"]["positive_prompt"] = job_input["prompt"]
     prompt["135"]["inputs"]["negative_prompt"] = job_input.get("negative_prompt", "bright tones, overexposed, static, blurred details, subtitles, style, works, paintings, images, static, overall gray, worst quality, low quality, JPEG compression residue, ugly, incomplete, extra fingers, poorly drawn hands, poorly drawn faces, deformed, disfigured, misshapen limbs, fused fingers, still picture, messy background, three legs, many people in the background, walking backwards")
     prompt["220"]["inputs"]["seed"] = job_input["seed"]
@@ -209,7 +364,7 @@ def handler(job):
     prompt["235"]["inputs"]["value"] = adjusted_width
     prompt["236"]["inputs"]["value"] = adjusted_height
     prompt["498"]["inputs"]["context_overlap"] = job_input.get("context_overlap", 48)
-    prompt["498"]["inputs"]["context_frames"] = length
+    prompt["498"]["inputs"]["context_frames"] = generated_length
 
     # step 설정 적용
     if "834" in prompt:
@@ -251,6 +406,11 @@ def handler(job):
                     prompt[low_lora_node_id]["inputs"][f"strength_{i+1}"] = lora_low_weight
                     logger.info(f"LoRA {i+1} LOW applied to node 553: {lora_low} with weight {lora_low_weight}")
 
+    # 프리뷰 설정 적용 - 1단계 샘플러가 끝나면 저해상도 프리뷰를 먼저 전송
+    if preview:
+        preview_prompt = build_preview_prompt(prompt, preview_scale, preview_crf)
+        logger.info(f"Preview enabled: scale {preview_scale}, crf {preview_crf}")
+
     ws_url = f"ws://{server_address}:8188/ws?clientId={client_id}"
     logger.info(f"Connecting to WebSocket: {ws_url}")
     
@@ -276,7 +436,6 @@ def handler(job):
     # 웹소켓 연결 시도 (최대 3분)
     max_attempts = int(180/5)  # 3분 (1초에 한 번씩 시도)
     for attempt in range(max_attempts):
-        import time
         try:
             ws.connect(ws_url)
             logger.info(f"웹소켓 연결 성공 (시도 {attempt+1})")
@@ -286,14 +445,77 @@ def handler(job):
             if attempt == max_attempts - 1:
                 raise Exception("웹소켓 연결 시간 초과 (3분)")
             time.sleep(5)
-    videos = get_videos(ws, prompt)
+    postprocess_seconds = [0.0]
+    def interpolate_output(video_path):
+        postprocess_start = time.time()
+        output_path = os.path.join(task_id, "interpolated.mp4")
+        interpolation.interpolate_video(video_path, output_path, frame_rate, length)
+        postprocess_seconds[0] += time.time() - postprocess_start
+        return output_path
+
+    preview_seconds = [None]
+    def send_preview(node_output):
+        # 프리뷰는 best-effort: 실패해도 본 작업은 계속 진행
+        for video in node_output.get('gifs', []):
+            try:
+                preview_seconds[0] = time.time() - job_start_time
+                logger.info(f"Preview ready after {preview_seconds[0]:.1f}s")
+                preview_size = os.path.getsize(video['fullpath'])
+                if preview_size > PREVIEW_MAX_BYTES:
+                    logger.warning(f"⚠️ 프리뷰 크기 초과로 전송 생략: {preview_size} bytes > {PREVIEW_MAX_BYTES} bytes")
+                elif job is not None:
+                    with open(video['fullpath'], 'rb') as f:
+                        preview_data = base64.b64encode(f.read()).decode('utf-8')
+                    runpod.serverless.progress_update(job, {"preview": preview_data, "preview_seconds": round(preview_seconds[0], 3)})
+            except Exception as e:
+                logger.warning(f"⚠️ 프리뷰 전송 실패: {e}")
+            finally:
+                workspace.remove_output(video['fullpath'])
+
+    node_seconds = {}
+    if preview:
+        # 프리뷰 프롬프트를 먼저 끝까지 실행해 LOW 단계보다 앞서도록 보장 (실패해도 본 작업은 계속 진행)
+        try:
+            get_videos(ws, preview_prompt, None, {PREVIEW_COMBINE_NODE_ID: send_preview}, node_seconds)
+        except Exception as e:
+            logger.warning(f"⚠️ 프리뷰 생성 실패: {e}")
+    videos = get_videos(
+        ws,
+        prompt,
+        interpolate_output if generated_length != length else None,
+        None,
+        node_seconds,
+    )
     ws.close()
 
+    # 출력 영상 1초당 GPU 시간/전체 시간 보고
+    # GPU 시간은 본 워크플로 노드의 실행 시간 합 (큐 대기, 출력 읽기/인코딩, 프리뷰 노드 제외)
+    total_seconds = time.time() - job_start_time
+    gpu_seconds = sum(seconds for node_id, seconds in node_seconds.items() if node_id not in PREVIEW_NODE_IDS)
+    output_seconds = length / frame_rate
+    metrics = {
+        "generated_frames": generated_length,
+        "output_frames": length,
+        "frame_rate": frame_rate,
+        "gpu_seconds": round(gpu_seconds, 3),
+        "interpolation_seconds": round(postprocess_seconds[0], 3),
+        "total_seconds": round(total_seconds, 3),
+        "gpu_seconds_per_output_second": round(gpu_seconds / output_seconds, 3),
+        "total_seconds_per_output_second": round(total_seconds / output_seconds, 3),
+    }
+    if preview:
+        metrics["preview_seconds"] = round(preview_seconds[0], 3) if preview_seconds[0] is not None else None
+        # 프리뷰 디코딩/인코딩은 LOW 단계 전에 실행되므로 그 시간이 전체 지연 시간에 그대로 더해짐
+        metrics["preview_overhead_seconds"] = round(sum(node_seconds.get(node_id, 0.0) for node_id in PREVIEW_NODE_IDS), 3)
+    logger.info(f"Job metrics: {metrics}")
+
     # 이미지가 없는 경우 처리
     for node_id in videos:
         if videos[node_id]:
-            return {"video": videos[node_id][0]}
+            return {"video": videos[node_id][0], "metrics": metrics}
     
     return {"error": "비디오를를 찾을 수 없습니다."}
 
-runpod.serverless.start({"handler": handler})
+if __name__ == "__main__":
+    workspace.start_reaper()
+    runpod.serverless.start({"handler": handler})
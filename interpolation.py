@@ -0,0 +1,58 @@
+import os
+import shutil
+import subprocess
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def get_ffmpeg_path():
+    """사용할 ffmpeg 실행 파일 경로를 반환 (FFMPEG_PATH > 시스템 ffmpeg > imageio-ffmpeg)"""
+    env_path = os.getenv('FFMPEG_PATH')
+    if env_path:
+        return env_path
+    system_path = shutil.which('ffmpeg')
+    if system_path:
+        return system_path
+    try:
+        # VideoHelperSuite가 사용하는 imageio-ffmpeg 번들 바이너리
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        raise Exception("ffmpeg를 찾을 수 없습니다. FFMPEG_PATH를 지정하거나 ffmpeg를 설치하세요.")
+
+
+def reduced_frame_count(length, factor):
+    """요청 프레임 수를 factor배 줄인 생성 프레임 수를 반환 (Wan 요구사항: 4n+1 프레임)"""
+    if factor <= 1:
+        return length
+    reduced = max(5, int(round((length - 1) / factor / 4.0)) * 4 + 1)
+    # 요청보다 적게 생성할 수 없으면 보간하지 않음
+    if reduced >= length:
+        return length
+    return reduced
+
+
+def interpolate_video(input_path, output_path, target_fps, target_frames, crf=19):
+    """ffmpeg 모션 보간(minterpolate)으로 target_fps, target_frames 길이의 영상을 생성"""
+    vf = (
+        f"minterpolate=fps={target_fps}:mi_mode=mci:mc_mode=aobmc:me_mode=bidir:vsbmc=1,"
+        # 보간 결과가 요청 길이보다 짧으면 마지막 프레임으로 채움
+        f"tpad=stop_mode=clone:stop={target_frames}"
+    )
+    command = [
+        get_ffmpeg_path(), '-y', '-loglevel', 'error',
+        '-i', input_path,
+        '-vf', vf,
+        '-frames:v', str(target_frames),
+        '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-crf', str(crf),
+        '-threads', str(os.cpu_count() or 1),
+        output_path,
+    ]
+    logger.info(f"🎞️ 프레임 보간 시작: {input_path} -> {output_path} ({target_frames} frames @ {target_fps}fps)")
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        logger.error(f"❌ 프레임 보간 실패: {result.stderr}")
+        raise Exception(f"프레임 보간 실패: {result.stderr}")
+    logger.info(f"✅ 프레임 보간 완료: {output_path}")
+    return output_path
@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 원본 내용 대신 해시만 기록하는 입력 키
+CONTENT_KEYS = (
+    "image_path", "image_url", "image_base64",
+    "end_image_path", "end_image_url", "end_image_base64",
+)
+TEXT_KEYS = ("prompt", "negative_prompt")
+
+
+def _sha256_file(file_path):
+    """파일 내용의 sha256과 크기를 반환 (읽을 수 없으면 None)"""
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+                size += len(chunk)
+        return {"sha256": digest.hexdigest(), "bytes": size}
+    except OSError:
+        return None
+
+
+def _source_type(job_input, prefix):
+    for input_type in ("path", "url", "base64"):
+        if f"{prefix}_{input_type}" in job_input:
+            return input_type
+    return None
+
+
+def _error_kind(error):
+    """에러 메시지에서 첫 ':' 앞부분만 반환 (뒷부분에는 URL 등 입력 원문이 섞일 수 있음)"""
+    return str(error).split(':', 1)[0].strip()[:200]
+
+
+def sanitize_job_input(job_input, resolved_paths, error=None):
+    """작업 입력에서 이미지/프롬프트 원문을 제거하고 파라미터와 내용 해시만 남긴 기록을 반환
+
+    resolved_paths: {"image": 로컬 파일 경로, "end_image": 로컬 파일 경로 또는 None}
+        (키는 있는데 값이 None이면 입력 해석(다운로드/디코딩)에 실패한 것으로 기록)
+    error: 작업이 거부되거나 실패한 경우의 에러 메시지
+    """
+    params = {
+        key: value for key, value in job_input.items()
+        if key not in CONTENT_KEYS and key not in TEXT_KEYS
+    }
+    texts = {}
+    for key in TEXT_KEYS:
+        if key in job_input and job_input[key] is not None:
+            text = str(job_input[key])
+            texts[key] = {"sha256": hashlib.sha256(text.encode('utf-8')).hexdigest(), "chars": len(text)}
+
+    sources = {}
+    for name in ("image", "end_image"):
+        input_type = _source_type(job_input, name)
+        file_path = resolved_paths.get(name)
+        if not input_type and not file_path:
+            continue
+        source = {"type": input_type or "default"}
+        if input_type and name in resolved_paths and not file_path:
+            source["resolved"] = False
+        content = _sha256_file(file_path) if file_path else None
+        if content:
+            source.update(content)
+        sources[name] = source
+
+    record = {"timestamp": time.time(), "params": params, "texts": texts, "sources": sources}
+    if error:
+        record["error"] = _error_kind(error)
+    return record
+
+
+class JobRecorder:
+    """정제된 작업 입력을 JSONL 파일에 추가 기록하는 클래스 (RECORD_JOBS_PATH가 설정된 경우에만 동작)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.getenv('RECORD_JOBS_PATH'))
+
+    @property
+    def enabled(self):
+        return bool(self.path)
+
+    def record(self, job_input, resolved_paths, error=None):
+        """작업 입력을 기록 (기록 실패는 작업에 영향을 주지 않음)"""
+        if not self.enabled:
+            return
+        try:
+            line = json.dumps(sanitize_job_input(job_input, resolved_paths, error), ensure_ascii=False)
+            with self._lock:
+                with open(self.path, 'a') as f:
+                    f.write(line + "\n")
+        except Exception as e:
+            logger.warning(f"⚠️ 작업 입력 기록 실패: {e}")
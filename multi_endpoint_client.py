@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Multi-endpoint Generate Video API client
+Routes jobs across several RunPod generate_video endpoints based on queue depth
+"""
+
+import time
+import threading
+from typing import Optional, Dict, Any, List
+import logging
+
+from generate_video_client import GenerateVideoClient
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class EndpointState:
+    """Routing state and latency statistics for a single endpoint"""
+
+    def __init__(self, client: GenerateVideoClient, default_execution_time: float, smoothing: float):
+        self.client = client
+        self.endpoint_id = client.runpod_endpoint_id
+        self.smoothing = smoothing
+
+        # Latest health snapshot
+        self.health: Optional[Dict[str, Any]] = None
+        self.health_updated_at = 0.0
+
+        # Exponentially weighted averages (seconds)
+        self.avg_delay_time = 0.0
+        self.avg_execution_time = default_execution_time
+        self.avg_submit_latency = 0.0
+
+        # Counters
+        self.submitted = 0
+        self.submit_failures = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        # Submissions not yet reflected in the latest health snapshot
+        self.unseen_submissions = 0
+        self.cooldown_until = 0.0
+
+    def _ewma(self, current: float, value: float) -> float:
+        return current + self.smoothing * (value - current)
+
+    def record_submit(self, latency: float, success: bool, cooldown: float):
+        if success:
+            self.submitted += 1
+            self.in_flight += 1
+            self.unseen_submissions += 1
+            self.avg_submit_latency = self._ewma(self.avg_submit_latency, latency)
+        else:
+            self.submit_failures += 1
+            self.cooldown_until = time.time() + cooldown
+
+    def record_result(self, result: Dict[str, Any]):
+        self.in_flight = max(0, self.in_flight - 1)
+        if result.get('status') == 'COMPLETED':
+            self.completed += 1
+            # RunPod reports delayTime/executionTime in milliseconds
+            if result.get('delay_time') is not None:
+                self.avg_delay_time = self._ewma(self.avg_delay_time, result['delay_time'] / 1000.0)
+            if result.get('execution_time') is not None:
+                self.avg_execution_time = self._ewma(self.avg_execution_time, result['execution_time'] / 1000.0)
+        else:
+            self.failed += 1
+
+    def expected_start_time(self, cold_start_penalty: float) -> float:
+        """
+        Estimate seconds until a newly submitted job starts running
+
+        Args:
+            cold_start_penalty: Seconds added when no worker is up
+
+        Returns:
+            Expected start time in seconds (inf while cooling down after a failure)
+        """
+        if time.time() < self.cooldown_until:
+            return float('inf')
+
+        jobs = (self.health or {}).get('jobs', {})
+        workers = (self.health or {}).get('workers', {})
+        in_queue = jobs.get('inQueue', 0)
+        idle = workers.get('idle', 0)
+        running = workers.get('running', 0)
+        active_workers = idle + running
+
+        waiting_ahead = in_queue + self.unseen_submissions
+
+        if idle > waiting_ahead:
+            return self.avg_delay_time
+
+        estimate = self.avg_delay_time
+        if active_workers == 0:
+            estimate += cold_start_penalty
+        estimate += (waiting_ahead - idle + 1) / max(active_workers, 1) * self.avg_execution_time
+        return estimate
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'endpoint_id': self.endpoint_id,
+            'submitted': self.submitted,
+            'submit_failures': self.submit_failures,
+            'completed': self.completed,
+            'failed': self.failed,
+            'in_flight': self.in_flight,
+            'avg_submit_latency': self.avg_submit_latency,
+            'avg_delay_time': self.avg_delay_time,
+            'avg_execution_time': self.avg_execution_time,
+            'health': self.health,
+        }
+
+
+class MultiEndpointGenerateVideoClient(GenerateVideoClient):
+    def __init__(
+        self,
+        runpod_endpoint_ids: List[str],
+        runpod_api_key: str,
+        api_base: str = "https://api.runpod.ai/v2",
+        health_interval: float = 15,
+        default_execution_time: float = 120,
+        cold_start_penalty: float = 60,
+        failure_cooldown: float = 60,
+        smoothing: float = 0.2
+    ):
+        """
+        Initialize multi-endpoint Generate Video client
+
+        Args:
+            runpod_endpoint_ids: RunPod endpoint IDs to balance across
+            runpod_api_key: RunPod API key
+            api_base: RunPod API base URL (override to target local/fake endpoints)
+            health_interval: Endpoint health refresh interval (seconds)
+            default_execution_time: Assumed job execution time before any job completes (seconds)
+            cold_start_penalty: Extra start time assumed for endpoints with no running workers (seconds)
+            failure_cooldown: Time an endpoint is skipped after a submission error (seconds)
+            smoothing: Weight of the newest sample in latency averages (0-1)
+        """
+        if not runpod_endpoint_ids:
+            raise ValueError("At least one endpoint ID is required")
+
+        # The first endpoint backs the inherited single-endpoint attributes
+        super().__init__(runpod_endpoint_ids[0], runpod_api_key, api_base)
+
+        self.health_interval = health_interval
+        self.cold_start_penalty = cold_start_penalty
+        self.failure_cooldown = failure_cooldown
+        self.endpoints = [
+            EndpointState(
+                GenerateVideoClient(endpoint_id, runpod_api_key, api_base),
+                default_execution_time,
+                smoothing
+            )
+            for endpoint_id in runpod_endpoint_ids
+        ]
+        self.job_endpoints: Dict[str, EndpointState] = {}
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+        logger.info(f"MultiEndpointGenerateVideoClient initialized - Endpoints: {', '.join(runpod_endpoint_ids)}")
+
+    def refresh_health(self):
+        """
+        Read health/queue depth from every endpoint
+        """
+        for endpoint in self.endpoints:
+            health = endpoint.client.get_health()
+            with self._lock:
+                endpoint.health = health
+                endpoint.health_updated_at = time.time()
+                if health is not None:
+                    # The snapshot now includes our own queued jobs
+                    endpoint.unseen_submissions = 0
+
+    def _health_loop(self):
+        while not self._stop_event.wait(self.health_interval):
+            try:
+                self.refresh_health()
+            except Exception as e:
+                logger.error(f"❌ Health refresh error: {e}")
+
+    def start_health_monitor(self):
+        """
+        Start periodic background health refresh
+        """
+        if self._health_thread and self._health_thread.is_alive():
+            return
+        self.refresh_health()
+        self._stop_event.clear()
+        self._health_thread = threading.Thread(target=self._health_loop, name="endpoint-health", daemon=True)
+        self._health_thread.start()
+
+    def stop_health_monitor(self):
+        """
+        Stop periodic background health refresh
+        """
+        self._stop_event.set()
+        if self._health_thread:
+            self._health_thread.join(timeout=5)
+            self._health_thread = None
+
+    def _ranked_endpoints(self) -> List[EndpointState]:
+        now = time.time()
+        if not self._health_thread and any(now - e.health_updated_at > self.health_interval for e in self.endpoints):
+            self.refresh_health()
+        with self._lock:
+            return sorted(self.endpoints, key=lambda e: e.expected_start_time(self.cold_start_penalty))
+
+    def submit_job(self, input_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Submit job to the endpoint with the lowest expected start time, failing over on errors
+
+        Args:
+            input_data: API input data
+
+        Returns:
+            Job ID or None (when every endpoint failed)
+        """
+        for endpoint in self._ranked_endpoints():
+            logger.info(f"Routing job to endpoint: {endpoint.endpoint_id}")
+            start_time = time.time()
+            job_id = endpoint.client.submit_job(input_data)
+            with self._lock:
+                endpoint.record_submit(time.time() - start_time, job_id is not None, self.failure_cooldown)
+                if job_id:
+                    self.job_endpoints[job_id] = endpoint
+            if job_id:
+                return job_id
+            logger.warning(f"⚠️ Submission to {endpoint.endpoint_id} failed, trying next endpoint")
+
+        logger.error("❌ Job submission failed on all endpoints")
+        return None
+
+    def wait_for_completion(self, job_id: str, check_interval: int = 10, max_wait_time: int = 1800) -> Dict[str, Any]:
+        """
+        Wait for job completion on the endpoint the job was routed to
+
+        Args:
+            job_id: Job ID
+            check_interval: Status check interval (seconds)
+            max_wait_time: Maximum wait time (seconds)
+
+        Returns:
+            Job result dictionary (with 'endpoint_id' added)
+        """
+        with self._lock:
+            endpoint = self.job_endpoints.get(job_id)
+        if endpoint is None:
+            logger.error(f"❌ Unknown job ID: {job_id}")
+            return {'status': 'UNKNOWN', 'error': 'Job was not submitted by this client', 'job_id': job_id}
+
+        result = endpoint.client.wait_for_completion(job_id, check_interval, max_wait_time)
+        result['endpoint_id'] = endpoint.endpoint_id
+        with self._lock:
+            endpoint.record_result(result)
+            self.job_endpoints.pop(job_id, None)
+        return result
+
+    def get_endpoint_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-endpoint routing and latency statistics
+
+        Returns:
+            List of statistics dictionaries, one per endpoint
+        """
+        with self._lock:
+            return [
+                dict(endpoint.stats(), expected_start_time=endpoint.expected_start_time(self.cold_start_penalty))
+                for endpoint in self.endpoints
+            ]
+
+
+def main():
+    """Usage example"""
+
+    # Configuration (change to actual values)
+    ENDPOINT_IDS = ["your-endpoint-id-1", "your-endpoint-id-2"]
+    RUNPOD_API_KEY = "your-runpod-api-key"
+
+    client = MultiEndpointGenerateVideoClient(
+        runpod_endpoint_ids=ENDPOINT_IDS,
+        runpod_api_key=RUNPOD_API_KEY
+    )
+    client.start_health_monitor()
+
+    result = client.create_video_from_image(
+        image_path="./example_image.png",
+        prompt="running man, grab the gun",
+        width=480,
+        height=832,
+        length=81,
+        steps=10,
+        seed=42,
+        cfg=2.0
+    )
+
+    if result.get('status') == 'COMPLETED':
+        client.save_video_result(result, "./output_multi.mp4")
+    else:
+        print(f"Error: {result.get('error')}")
+
+    for stats in client.get_endpoint_stats():
+        print(stats)
+
+    client.stop_health_monitor()
+
+
+if __name__ == "__main__":
+    main()
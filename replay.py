@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+Replay load-test tool
+Replays job inputs recorded by handler.py (RECORD_JOBS_PATH) against a RunPod endpoint
+or against handler() directly with a stand-in ComfyUI server
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import base64
+import random
+import socket
+import hashlib
+import argparse
+import threading
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional, Dict, Any, List, Callable
+import logging
+
+# Logging configuration
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+PLACEHOLDER_IMAGE_PATH = "/example_image.png"
+# Inputs that fail like the recorded one did when the worker could not download/decode it
+UNRESOLVABLE_INPUTS = {"url": "http://127.0.0.1:9/replay-unresolvable-input", "base64": "invalid"}
+
+
+def load_records(records_path: str) -> List[Dict[str, Any]]:
+    """
+    Load recorded job inputs from a JSONL file
+
+    Args:
+        records_path: JSONL file written by handler.py (RECORD_JOBS_PATH)
+
+    Returns:
+        List of record dictionaries
+    """
+    records = []
+    with open(records_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+def build_job_input(
+    record: Dict[str, Any],
+    image_base64: Optional[str] = None,
+    end_image_base64: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Rebuild a job input from a sanitized record
+
+    Prompts are replaced by placeholder text of the same length. Image content is
+    replaced by the given base64 image, or by a placeholder path when none is given.
+    Images the worker failed to download or decode are replaced by an input of the
+    same type that fails the same way.
+
+    Args:
+        record: Sanitized job record
+        image_base64: Base64 image used for the start image
+        end_image_base64: Base64 image used for the end image (defaults to image_base64)
+
+    Returns:
+        Job input dictionary
+    """
+    job_input = dict(record.get("params", {}))
+
+    texts = record.get("texts", {})
+    for key in ("prompt", "negative_prompt"):
+        if key in texts:
+            chars = texts[key].get("chars", 0)
+            job_input[key] = ("replay " * (chars // 7 + 1))[:chars]
+    job_input.setdefault("prompt", "replay")
+
+    sources = record.get("sources", {})
+    images = {"image": image_base64, "end_image": end_image_base64 or image_base64}
+    for name, content in images.items():
+        source = sources.get(name)
+        if not source or source.get("type") == "default":
+            continue
+        if source.get("resolved") is False and source.get("type") in UNRESOLVABLE_INPUTS:
+            job_input[f"{name}_{source['type']}"] = UNRESOLVABLE_INPUTS[source["type"]]
+        elif content:
+            job_input[f"{name}_base64"] = content
+        else:
+            job_input[f"{name}_path"] = PLACEHOLDER_IMAGE_PATH
+
+    return job_input
+
+
+class StandInComfyUI:
+    """
+    Minimal stand-in for the ComfyUI HTTP/websocket API used by handler.py
+
+    Implements GET /, POST /prompt, GET /history/<id> and the /ws websocket. Each prompt
+    "executes" for exec_seconds + seconds_per_frame * num_frames, split between the HIGH (220)
+    and LOW (540) samplers, then writes an MP4 (a real clip when ffmpeg is available) and
+    reports it on node 131. Like ComfyUI's cache, node 220 is skipped when its inputs match
+    the previous prompt, so the preview-only prompt (see handler.build_preview_prompt) followed
+    by the full workflow samples HIGH once. Received prompts are kept in `prompts` by prompt id
+    and the nodes that actually ran in `executed`.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        host: str = "127.0.0.1",
+        port: int = 8188,
+        exec_seconds: float = 1.0,
+        seconds_per_frame: float = 0.0,
+        failure_rate: float = 0.0,
+        preview_failure_rate: float = 0.0
+    ):
+        self.output_dir = output_dir
+        self.host = host
+        self.port = port
+        self.exec_seconds = exec_seconds
+        self.seconds_per_frame = seconds_per_frame
+        self.failure_rate = failure_rate
+        self.preview_failure_rate = preview_failure_rate
+
+        self.history: Dict[str, Any] = {}
+        self.prompts: Dict[str, Dict[str, Any]] = {}
+        self.executed: List[str] = []
+        self._cached_high: Optional[str] = None
+        self.sockets: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+
+        try:
+            from interpolation import get_ffmpeg_path
+            self.ffmpeg_path = get_ffmpeg_path()
+        except Exception:
+            self.ffmpeg_path = None
+
+        os.makedirs(output_dir, exist_ok=True)
+
+    def start(self):
+        stand_in = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, data):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith('/ws'):
+                    stand_in._serve_websocket(self)
+                elif self.path.startswith('/history/'):
+                    prompt_id = self.path.rsplit('/', 1)[1]
+                    with stand_in._lock:
+                        entry = stand_in.history.get(prompt_id)
+                    self._send_json({prompt_id: entry} if entry else {})
+                else:
+                    self._send_json({})
+
+            def do_POST(self):
+                if self.path != '/prompt':
+                    self.send_error(404)
+                    return
+                data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                prompt_id = str(uuid.uuid4())
+                threading.Thread(
+                    target=stand_in._execute,
+                    args=(prompt_id, data['prompt'], data.get('client_id')),
+                    daemon=True
+                ).start()
+                self._send_json({"prompt_id": prompt_id, "number": 0, "node_errors": {}})
+
+        self._server = ThreadingHTTPServer((self.host, self.port), RequestHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Stand-in ComfyUI listening on {self.host}:{self.port}")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _serve_websocket(self, request: BaseHTTPRequestHandler):
+        key = request.headers.get('Sec-WebSocket-Key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+        request.send_response(101)
+        request.send_header('Upgrade', 'websocket')
+        request.send_header('Connection', 'Upgrade')
+        request.send_header('Sec-WebSocket-Accept', accept)
+        request.end_headers()
+        request.wfile.flush()
+
+        client_id = request.path.partition('clientId=')[2]
+        connection = request.connection
+        with self._lock:
+            self.sockets.setdefault(client_id, []).append(connection)
+        try:
+            # Block until the client closes (opcode 8) or disconnects
+            while True:
+                header = request.rfile.read(2)
+                if len(header) < 2 or header[0] & 0x0F == 8:
+                    break
+                length = header[1] & 0x7F
+                if length == 126:
+                    length = int.from_bytes(request.rfile.read(2), 'big')
+                elif length == 127:
+                    length = int.from_bytes(request.rfile.read(8), 'big')
+                request.rfile.read(length + (4 if header[1] & 0x80 else 0))
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self.sockets.get(client_id, []).remove(connection)
+            request.close_connection = True
+
+    def _broadcast(self, client_id: Optional[str], message: Dict[str, Any]):
+        payload = json.dumps(message).encode('utf-8')
+        if len(payload) < 126:
+            frame = bytes([0x81, len(payload)])
+        elif len(payload) < 65536:
+            frame = bytes([0x81, 126]) + len(payload).to_bytes(2, 'big')
+        else:
+            frame = bytes([0x81, 127]) + len(payload).to_bytes(8, 'big')
+        with self._lock:
+            connections = list(self.sockets.get(client_id, []))
+            for connection in connections:
+                try:
+                    connection.sendall(frame + payload)
+                except OSError:
+                    pass
+
+    def _write_video(self, prefix: str, frames: int) -> Dict[str, Any]:
+        with self._lock:
+            self._counter += 1
+            filename = f"{prefix}_{self._counter:05d}.mp4"
+        fullpath = os.path.join(self.output_dir, filename)
+        written = False
+        if self.ffmpeg_path:
+            result = subprocess.run([
+                self.ffmpeg_path, '-y', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', 'testsrc=size=64x64:rate=16',
+                '-frames:v', str(frames), '-pix_fmt', 'yuv420p', fullpath
+            ], capture_output=True)
+            written = result.returncode == 0
+        if not written:
+            with open(fullpath, 'wb') as f:
+                f.write(os.urandom(frames * 1024))
+        return {"filename": filename, "subfolder": "", "type": "output", "format": "video/h264-mp4", "fullpath": fullpath}
+
+    def _run_node(self, client_id: Optional[str], prompt_id: str, node_id: str, seconds: float):
+        with self._lock:
+            self.executed.append(node_id)
+        self._broadcast(client_id, {"type": "executing", "data": {"node": node_id, "prompt_id": prompt_id}})
+        time.sleep(seconds)
+
+    def _execute(self, prompt_id: str, prompt: Dict[str, Any], client_id: Optional[str]):
+        frames = int(prompt.get("541", {}).get("inputs", {}).get("num_frames", 81))
+        duration = self.exec_seconds + self.seconds_per_frame * frames
+        outputs = {}
+        with self._lock:
+            self.prompts[prompt_id] = prompt
+
+        self._broadcast(client_id, {"type": "execution_start", "data": {"prompt_id": prompt_id}})
+        high_key = json.dumps(prompt.get("220"), sort_keys=True)
+        with self._lock:
+            cached, self._cached_high = high_key == self._cached_high, high_key
+        if cached:
+            self._broadcast(client_id, {"type": "execution_cached", "data": {"nodes": ["220"], "prompt_id": prompt_id}})
+        else:
+            self._run_node(client_id, prompt_id, "220", duration / 2)
+
+        # Preview-only prompt (see handler.build_preview_prompt) stops after the preview encoder
+        preview_node = next((node_id for node_id, node in prompt.items()
+                             if node_id != "131" and node.get("class_type") == "VHS_VideoCombine"), None)
+        if preview_node:
+            self._run_node(client_id, prompt_id, preview_node, 0)
+            if random.random() >= self.preview_failure_rate:
+                preview_output = {"gifs": [self._write_video("WanVideo_preview", frames)]}
+                outputs[preview_node] = preview_output
+                self._broadcast(client_id, {"type": "executed", "data": {"node": preview_node, "output": preview_output, "prompt_id": prompt_id}})
+            else:
+                self._broadcast(client_id, {"type": "execution_error", "data": {"node_id": preview_node, "exception_message": "Stand-in preview failure", "prompt_id": prompt_id}})
+
+        if "131" in prompt:
+            self._run_node(client_id, prompt_id, "540", duration / 2)
+            self._run_node(client_id, prompt_id, "131", 0)
+            if random.random() >= self.failure_rate:
+                outputs["131"] = {"gifs": [self._write_video("WanVideo_X264", frames)]}
+
+        with self._lock:
+            self.history[prompt_id] = {"outputs": outputs}
+        self._broadcast(client_id, {"type": "executing", "data": {"node": None, "prompt_id": prompt_id}})
+
+
+def _job_error(result: Dict[str, Any]) -> Optional[str]:
+    if result.get('status') and result.get('status') != 'COMPLETED':
+        return str(result.get('error') or result.get('status'))
+    if result.get('error'):
+        return str(result['error'])
+    return None
+
+
+def endpoint_target(
+    endpoint_id: str,
+    api_key: str,
+    api_base: str = "https://api.runpod.ai/v2",
+    check_interval: int = 5
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Build a target that submits jobs to a RunPod endpoint via GenerateVideoClient
+
+    Returns:
+        Callable taking a job input and returning the job result dictionary
+    """
+    from generate_video_client import GenerateVideoClient
+
+    client = GenerateVideoClient(endpoint_id, api_key, api_base)
+
+    def run(job_input: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = client.submit_job(job_input)
+        if not job_id:
+            return {"error": "Job submission failed"}
+        return client.wait_for_completion(job_id, check_interval=check_interval)
+
+    return run
+
+
+def handler_target(server_address: str = "127.0.0.1") -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Build a target that calls handler.process_job() in-process (no RunPod progress updates)
+
+    Returns:
+        Callable taking a job input and returning the handler result dictionary
+    """
+    os.environ.setdefault('WORKFLOW_DIR', os.path.dirname(os.path.abspath(__file__)))
+    import handler
+
+    handler.server_address = server_address
+
+    def run(job_input: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return handler.process_job(job_input)
+        except Exception as e:
+            return {"error": str(e)}
+
+    return run
+
+
+def run_replay(
+    job_inputs: List[Dict[str, Any]],
+    target: Callable[[Dict[str, Any]], Dict[str, Any]],
+    rate: Optional[float] = None,
+    concurrency: int = 1
+) -> Dict[str, Any]:
+    """
+    Replay job inputs against a target
+
+    With rate set, jobs arrive open-loop at that many jobs/second (at most `concurrency`
+    in flight) and latency is measured from the scheduled arrival time. Without rate,
+    `concurrency` workers replay jobs back to back.
+
+    Args:
+        job_inputs: Job inputs to replay, in order
+        target: Callable returning a job result dictionary
+        rate: Arrival rate (jobs/second), or None for closed-loop replay
+        concurrency: Maximum jobs in flight
+
+    Returns:
+        Dictionary with 'samples' and 'wall_seconds'
+    """
+    samples: List[Optional[Dict[str, Any]]] = [None] * len(job_inputs)
+
+    def run_one(index: int, scheduled_at: float):
+        started_at = time.time()
+        try:
+            result = target(job_inputs[index])
+        except Exception as e:
+            result = {"error": str(e)}
+        finished_at = time.time()
+        samples[index] = {
+            "index": index,
+            "latency": finished_at - scheduled_at,
+            "service_time": finished_at - started_at,
+            "error": _job_error(result),
+            "metrics": result.get('metrics') or (result.get('output') or {}).get('metrics'),
+        }
+        logger.info(f"[{index + 1}/{len(job_inputs)}] {'ERROR ' + samples[index]['error'] if samples[index]['error'] else 'OK'} ({samples[index]['latency']:.1f}s)")
+
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for index in range(len(job_inputs)):
+            scheduled_at = time.time()
+            if rate:
+                scheduled_at = start_time + index / rate
+                delay = scheduled_at - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            executor.submit(run_one, index, scheduled_at)
+
+    return {"samples": [s for s in samples if s is not None], "wall_seconds": time.time() - start_time}
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    # Nearest-rank percentile
+    index = max(0, min(len(ordered) - 1, math.ceil(percent / 100.0 * len(ordered)) - 1))
+    return round(ordered[index], 3)
+
+
+def _repeat_rate(keys: List[Any]) -> Optional[float]:
+    """Share of keys already seen earlier in the sequence (hit rate of an unbounded cache)"""
+    if not keys:
+        return None
+    seen = set()
+    hits = 0
+    for key in keys:
+        if key in seen:
+            hits += 1
+        seen.add(key)
+    return round(hits / len(keys), 4)
+
+
+def summarize(records: List[Dict[str, Any]], replay: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a load-test report
+
+    Args:
+        records: Replayed records (used for cache hit rates)
+        replay: Result of run_replay()
+
+    Returns:
+        Report dictionary (throughput, latency percentiles, cache hit rates, replay errors
+        and the errors recorded on the worker for the same jobs)
+    """
+    samples = replay["samples"]
+    succeeded = [s for s in samples if not s["error"]]
+    latencies = [s["latency"] for s in succeeded]
+    wall_seconds = replay["wall_seconds"]
+
+    def content_key(record, name):
+        return (record.get("sources", {}).get(name) or {}).get("sha256")
+
+    # Hit rates an input/LoRA cache would see on this traffic (first occurrence = miss)
+    cache_hit_rates = {
+        "input_image": _repeat_rate([content_key(r, "image") for r in records if content_key(r, "image")]),
+        "inputs": _repeat_rate([(content_key(r, "image"), content_key(r, "end_image")) for r in records]),
+        "lora_set": _repeat_rate([
+            json.dumps(r.get("params", {}).get("lora_pairs", []), sort_keys=True) for r in records
+        ]),
+    }
+
+    job_metrics = {}
+    for key in ("gpu_seconds", "total_seconds", "gpu_seconds_per_output_second", "total_seconds_per_output_second", "preview_seconds", "preview_overhead_seconds"):
+        values = [s["metrics"][key] for s in succeeded if s["metrics"] and s["metrics"].get(key) is not None]
+        if values:
+            job_metrics[key] = {"mean": round(sum(values) / len(values), 3), "p50": _percentile(values, 50), "p95": _percentile(values, 95)}
+
+    return {
+        "jobs": len(samples),
+        "succeeded": len(succeeded),
+        "failed": len(samples) - len(succeeded),
+        "wall_seconds": round(wall_seconds, 3),
+        "throughput_jobs_per_second": round(len(succeeded) / wall_seconds, 4) if wall_seconds > 0 else None,
+        "latency_seconds": {
+            "p50": _percentile(latencies, 50),
+            "p90": _percentile(latencies, 90),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": round(max(latencies), 3) if latencies else None,
+        },
+        "cache_hit_rates": cache_hit_rates,
+        "errors": dict(Counter(s["error"][:200] for s in samples if s["error"])),
+        "recorded_errors": dict(Counter(r["error"] for r in records if r.get("error"))),
+        "job_metrics": job_metrics,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded job inputs for load testing")
+    parser.add_argument("records", help="JSONL file recorded by handler.py (RECORD_JOBS_PATH)")
+    parser.add_argument("--target", choices=["endpoint", "handler"], default="handler")
+    parser.add_argument("--endpoint-id", help="RunPod endpoint ID (endpoint target)")
+    parser.add_argument("--api-key", default=os.getenv("RUNPOD_API_KEY"), help="RunPod API key (endpoint target)")
+    parser.add_argument("--api-base", default="https://api.runpod.ai/v2")
+    parser.add_argument("--rate", type=float, help="Open-loop arrival rate (jobs/second); omit for closed-loop replay")
+    parser.add_argument("--concurrency", type=int, default=1, help="Maximum jobs in flight")
+    parser.add_argument("--limit", type=int, help="Replay only the first N records")
+    parser.add_argument("--image", help="Image file sent in place of recorded start images")
+    parser.add_argument("--end-image", help="Image file sent in place of recorded end images")
+    parser.add_argument("--stand-in-exec-seconds", type=float, default=1.0, help="Stand-in ComfyUI base execution time")
+    parser.add_argument("--stand-in-seconds-per-frame", type=float, default=0.0, help="Stand-in ComfyUI execution time per frame")
+    parser.add_argument("--stand-in-failure-rate", type=float, default=0.0, help="Share of stand-in prompts returning no video")
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    records = load_records(args.records)
+    if args.limit:
+        records = records[:args.limit]
+    if not records:
+        parser.error(f"No records in {args.records}")
+
+    def read_base64(path):
+        if not path:
+            return None
+        with open(path, 'rb') as f:
+            return base64.b64encode(f.read()).decode('utf-8')
+
+    image_base64 = read_base64(args.image)
+    end_image_base64 = read_base64(args.end_image)
+    job_inputs = [build_job_input(record, image_base64, end_image_base64) for record in records]
+
+    stand_in = None
+    if args.target == "endpoint":
+        if not args.endpoint_id or not args.api_key:
+            parser.error("--endpoint-id and --api-key are required for the endpoint target")
+        target = endpoint_target(args.endpoint_id, args.api_key, args.api_base)
+    else:
+        # handler.py talks to ComfyUI on the fixed port 8188
+        with socket.socket() as probe:
+            if probe.connect_ex(("127.0.0.1", 8188)) == 0:
+                parser.error("Port 8188 is already in use; stop ComfyUI before replaying against the stand-in")
+        import tempfile
+        stand_in = StandInComfyUI(
+            output_dir=tempfile.mkdtemp(prefix="standin_output_"),
+            exec_seconds=args.stand_in_exec_seconds,
+            seconds_per_frame=args.stand_in_seconds_per_frame,
+            failure_rate=args.stand_in_failure_rate
+        )
+        stand_in.start()
+        os.environ.setdefault('COMFY_OUTPUT_DIR', stand_in.output_dir)
+        target = handler_target()
+
+    logger.info(f"Replaying {len(job_inputs)} jobs against {args.target} "
+                f"({'rate ' + str(args.rate) + '/s' if args.rate else 'closed-loop'}, concurrency {args.concurrency})")
+    try:
+        replay = run_replay(job_inputs, target, rate=args.rate, concurrency=args.concurrency)
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+    report = summarize(records, replay)
+    report_json = json.dumps(report, indent=2, ensure_ascii=False)
+    print(report_json)
+    if args.report:
+        with open(args.report, 'w') as f:
+            f.write(report_json + "\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import asyncio
+import base64
+
+import pytest
+
+from fake_runpod_endpoint import FakeRunPodServer, FakeEndpointConfig
+from async_generate_video_client import AsyncGenerateVideoClient
+
+VIDEO_BYTES = b"fake mp4 data"
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeRunPodServer({
+        "ok": FakeEndpointConfig(polls_until_complete=1, output={"video": base64.b64encode(VIDEO_BYTES).decode()}),
+        "failing": FakeEndpointConfig(final_status="FAILED", error="CUDA out of memory"),
+        "stuck": FakeEndpointConfig(polls_until_complete=10 ** 6),
+    }).start()
+    yield server
+    server.stop()
+
+
+def run(server, endpoint_id, body):
+    async def main():
+        async with AsyncGenerateVideoClient(endpoint_id, "test-key", api_base=server.api_base) as client:
+            return await body(client)
+    return asyncio.run(main())
+
+
+def test_submit_and_wait_completed(fake_server):
+    async def body(client):
+        job_id = await client.submit_job({"prompt": "x"})
+        return job_id, await client.wait_for_completion(job_id, check_interval=0.01)
+
+    job_id, result = run(fake_server, "ok", body)
+
+    assert fake_server.jobs[job_id]["input"] == {"prompt": "x"}
+    assert result["status"] == "COMPLETED"
+    assert result["job_id"] == job_id
+    assert result["delay_time"] == 1000
+    assert result["execution_time"] == 10000
+
+
+def test_wait_reports_failed_job(fake_server):
+    async def body(client):
+        job_id = await client.submit_job({"prompt": "x"})
+        return await client.wait_for_completion(job_id, check_interval=0.01)
+
+    result = run(fake_server, "failing", body)
+
+    assert result["status"] == "FAILED"
+    assert result["error"] == "CUDA out of memory"
+
+
+def test_wait_times_out(fake_server):
+    async def body(client):
+        job_id = await client.submit_job({"prompt": "x"})
+        return await client.wait_for_completion(job_id, check_interval=0.01, max_wait_time=0.1)
+
+    assert run(fake_server, "stuck", body)["status"] == "TIMEOUT"
+
+
+def test_cancelling_wait_cancels_runpod_job(fake_server):
+    async def body(client):
+        job_id = await client.submit_job({"prompt": "x"})
+        task = asyncio.create_task(client.wait_for_completion(job_id, check_interval=0.01))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return job_id
+
+    job_id = run(fake_server, "stuck", body)
+
+    assert fake_server.jobs[job_id]["cancelled"] is True
+
+
+def test_batch_process_images_respects_max_concurrency(fake_server, tmp_path):
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    for i in range(6):
+        (image_dir / f"img{i}.png").write_bytes(b"png")
+    in_flight = 0
+    peak = 0
+
+    async def body(client):
+        create_video_from_image = client.create_video_from_image
+
+        async def tracked(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                await asyncio.sleep(0.05)
+                return await create_video_from_image(check_interval=0.01, **kwargs)
+            finally:
+                in_flight -= 1
+
+        client.create_video_from_image = tracked
+        return await client.batch_process_images(str(image_dir), str(tmp_path / "out"), max_concurrency=2)
+
+    results = run(fake_server, "ok", body)
+
+    assert results["successful"] == 6
+    assert peak == 2
+    assert fake_server.submissions["ok"] == 6
+    assert (tmp_path / "out" / "result_img0.mp4").read_bytes() == VIDEO_BYTES
+
+
+def test_save_video_result_without_output(tmp_path):
+    async def main():
+        client = AsyncGenerateVideoClient("ok", "test-key")
+        return await client.save_video_result({"status": "COMPLETED", "output": None}, str(tmp_path / "out.mp4"))
+
+    assert asyncio.run(main()) is False
+    assert not (tmp_path / "out.mp4").exists()
@@ -0,0 +1,204 @@
+import base64
+import hashlib
+import json
+import os
+
+import pytest
+
+import handler
+from job_recorder import JobRecorder
+from replay import StandInComfyUI
+from workspace import WorkspaceManager
+from interpolation import get_ffmpeg_path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def has_ffmpeg():
+    try:
+        return bool(get_ffmpeg_path())
+    except Exception:
+        return False
+
+
+def make_job_input(**kwargs):
+    job_input = {"prompt": "running man", "seed": 42, "cfg": 2.0, "width": 64, "height": 64, "length": 17}
+    job_input.update(kwargs)
+    return job_input
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    """handler.py pointed at the repo workflows and a throwaway workspace"""
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    monkeypatch.setattr(handler, "workflow_dir", REPO_ROOT)
+    monkeypatch.setattr(handler, "server_address", "127.0.0.1")
+    monkeypatch.setattr(handler, "workspace", WorkspaceManager(
+        str(tmp_path / "scratch"), output_dir=str(output_dir), min_free_bytes=0, scratch_min_free_bytes=0
+    ))
+    return output_dir
+
+
+@pytest.fixture
+def comfy(worker):
+    stand_in = StandInComfyUI(str(worker), exec_seconds=0.2)
+    stand_in.start()
+    yield stand_in
+    stand_in.stop()
+
+
+@pytest.mark.parametrize("factor", [2.9, "two", 0, True])
+def test_invalid_interpolation_factor_is_rejected(worker, factor):
+    result = handler.process_job(make_job_input(interpolation_factor=factor))
+
+    assert "interpolation_factor" in result["error"]
+
+
+@pytest.mark.skipif(not has_ffmpeg(), reason="ffmpeg not available")
+@pytest.mark.parametrize("factor", [2, 2.0, "2"])
+def test_interpolation_generates_fewer_frames(comfy, factor):
+    result = handler.process_job(make_job_input(interpolation_factor=factor))
+
+    (prompt,) = comfy.prompts.values()
+    assert prompt["541"]["inputs"]["num_frames"] == 9
+    assert prompt["498"]["inputs"]["context_frames"] == 9
+    # Generated clip keeps the playback duration of the requested one: 16 * (9 - 1) / (17 - 1)
+    assert prompt["131"]["inputs"]["frame_rate"] == 8
+    assert result["video"]
+    assert result["metrics"]["generated_frames"] == 9
+    assert result["metrics"]["output_frames"] == 17
+    assert result["metrics"]["frame_rate"] == 16
+    assert result["metrics"]["interpolation_seconds"] > 0
+
+
+def test_gpu_seconds_counts_node_execution_only(comfy):
+    result = handler.process_job(make_job_input())
+
+    (prompt,) = comfy.prompts.values()
+    assert prompt["541"]["inputs"]["num_frames"] == 17
+    assert prompt["131"]["inputs"]["frame_rate"] == 16
+    metrics = result["metrics"]
+    assert 0.15 <= metrics["gpu_seconds"] < metrics["total_seconds"]
+    assert metrics["interpolation_seconds"] == 0
+    assert os.listdir(comfy.output_dir) == []
+
+
+@pytest.fixture
+def progress_updates(monkeypatch):
+    updates = []
+    monkeypatch.setattr(handler.runpod.serverless, "progress_update", lambda job, progress: updates.append((job, progress)))
+    return updates
+
+
+def test_preview_runs_before_low_stage(comfy, progress_updates):
+    result = handler.process_job(make_job_input(preview=True), {"id": "job-1"})
+
+    preview_prompt, full_prompt = comfy.prompts.values()
+    assert handler.PREVIEW_COMBINE_NODE_ID in preview_prompt
+    assert "540" not in preview_prompt and "131" not in preview_prompt
+    assert not set(handler.PREVIEW_NODE_IDS) & set(full_prompt)
+    assert preview_prompt["220"] == full_prompt["220"]
+    # HIGH is sampled once and reused from the cache by the full workflow
+    assert comfy.executed == ["220", handler.PREVIEW_COMBINE_NODE_ID, "540", "131"]
+
+    ((job, progress),) = progress_updates
+    assert job == {"id": "job-1"}
+    assert progress["preview"]
+    metrics = result["metrics"]
+    assert result["video"]
+    assert progress["preview_seconds"] == metrics["preview_seconds"] < metrics["total_seconds"]
+    assert 0 < metrics["preview_overhead_seconds"] < metrics["total_seconds"]
+    assert os.listdir(comfy.output_dir) == []
+
+
+def test_preview_without_runpod_job_skips_progress_update(comfy, progress_updates):
+    result = handler.process_job(make_job_input(preview=True))
+
+    assert result["video"]
+    assert result["metrics"]["preview_seconds"] is not None
+    assert progress_updates == []
+    assert os.listdir(comfy.output_dir) == []
+
+
+def test_oversized_preview_is_not_sent(comfy, progress_updates, monkeypatch):
+    monkeypatch.setattr(handler, "PREVIEW_MAX_BYTES", 1)
+
+    result = handler.process_job(make_job_input(preview=True), {"id": "job-1"})
+
+    assert result["video"]
+    assert progress_updates == []
+    assert os.listdir(comfy.output_dir) == []
+
+
+def test_preview_delivery_failure_does_not_fail_job(comfy, monkeypatch):
+    def fail(job, progress):
+        raise RuntimeError("progress update failed")
+    monkeypatch.setattr(handler.runpod.serverless, "progress_update", fail)
+
+    result = handler.process_job(make_job_input(preview=True), {"id": "job-1"})
+
+    assert result["video"]
+    assert os.listdir(comfy.output_dir) == []
+
+
+def test_preview_execution_failure_does_not_fail_job(comfy, progress_updates):
+    comfy.preview_failure_rate = 1.0
+
+    result = handler.process_job(make_job_input(preview=True), {"id": "job-1"})
+
+    assert result["video"]
+    assert result["metrics"]["preview_seconds"] is None
+    assert progress_updates == []
+
+
+@pytest.mark.parametrize("params", [
+    {"preview": "yes"},
+    {"preview": True, "preview_scale": 0},
+    {"preview": True, "preview_scale": 1.5},
+    {"preview": True, "preview_scale": "0.5"},
+    {"preview": True, "preview_crf": 2.5},
+    {"preview": True, "preview_crf": 60},
+])
+def test_invalid_preview_params_are_rejected_before_queueing(comfy, params):
+    result = handler.process_job(make_job_input(**params))
+
+    assert "preview" in result["error"]
+    assert comfy.prompts == {}
+
+
+@pytest.fixture
+def records(tmp_path, monkeypatch):
+    path = tmp_path / "records.jsonl"
+    monkeypatch.setattr(handler, "recorder", JobRecorder(str(path)))
+    return lambda: [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_refused_job_is_recorded(worker, records, monkeypatch):
+    monkeypatch.setattr(handler.workspace, "check_free_space", lambda: "디스크 여유 공간 부족: 출력 디렉토리 1.0GB 남음")
+
+    result = handler.process_job(make_job_input(image_url="https://example.com/a.png"))
+
+    assert result["error"].startswith("디스크 여유 공간 부족")
+    (record,) = records()
+    assert record["error"] == "디스크 여유 공간 부족"
+    assert record["sources"] == {"image": {"type": "url"}}
+
+
+def test_failed_input_decode_is_recorded(worker, records):
+    with pytest.raises(Exception, match="Base64"):
+        handler.process_job(make_job_input(image_base64="invalid"))
+
+    (record,) = records()
+    assert record["error"] == "Base64 디코딩 실패"
+    assert record["sources"] == {"image": {"type": "base64", "resolved": False}}
+
+
+def test_completed_job_is_recorded_with_input_hash(comfy, records):
+    image = base64.b64encode(b"start image").decode()
+
+    handler.process_job(make_job_input(image_base64=image))
+
+    (record,) = records()
+    assert "error" not in record
+    assert record["sources"]["image"]["sha256"] == hashlib.sha256(b"start image").hexdigest()
@@ -0,0 +1,52 @@
+import re
+import subprocess
+
+import pytest
+
+from interpolation import reduced_frame_count, interpolate_video, get_ffmpeg_path
+
+
+def find_ffmpeg():
+    try:
+        return get_ffmpeg_path()
+    except Exception:
+        return None
+
+
+def count_frames(ffmpeg_path, video_path):
+    result = subprocess.run([ffmpeg_path, '-i', video_path, '-map', '0:v', '-f', 'null', '-'], capture_output=True, text=True)
+    return int(re.findall(r"frame=\s*(\d+)", result.stderr)[-1])
+
+
+@pytest.mark.parametrize("length, factor, expected", [
+    (81, 2, 41),
+    (81, 3, 29),
+    (121, 2, 61),
+    (13, 4, 5),
+])
+def test_reduced_frame_count_generates_4n_plus_1_frames(length, factor, expected):
+    assert reduced_frame_count(length, factor) == expected
+
+
+@pytest.mark.parametrize("length, factor", [
+    (81, 1),
+    (1, 2),
+    (4, 2),
+    (5, 2),
+])
+def test_reduced_frame_count_disables_interpolation_when_not_smaller(length, factor):
+    assert reduced_frame_count(length, factor) == length
+
+
+@pytest.mark.skipif(find_ffmpeg() is None, reason="ffmpeg not available")
+def test_interpolate_video_outputs_target_frame_count(tmp_path):
+    ffmpeg_path = find_ffmpeg()
+    generated = str(tmp_path / "generated.mp4")
+    subprocess.run([
+        ffmpeg_path, '-y', '-loglevel', 'error', '-f', 'lavfi', '-i', 'testsrc=size=64x64:rate=8',
+        '-frames:v', '9', '-pix_fmt', 'yuv420p', generated
+    ], check=True)
+
+    output = interpolate_video(generated, str(tmp_path / "interpolated.mp4"), 16, 17)
+
+    assert count_frames(ffmpeg_path, output) == 17
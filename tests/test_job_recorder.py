@@ -0,0 +1,73 @@
+import hashlib
+import json
+
+from job_recorder import sanitize_job_input, JobRecorder
+
+PROMPT = "a secret prompt about a red fox"
+URL = "https://example.com/private/start.png?token=secret"
+BASE64 = "c2VjcmV0IGVuZCBpbWFnZQ=="
+
+
+def make_job_input():
+    return {
+        "prompt": PROMPT,
+        "negative_prompt": "blurry",
+        "image_url": URL,
+        "end_image_base64": BASE64,
+        "seed": 42,
+        "lora_pairs": [{"high": "a.safetensors", "low": "b.safetensors"}],
+    }
+
+
+def test_sanitize_keeps_params_and_hashes_only(tmp_path):
+    start = tmp_path / "input_image.jpg"
+    start.write_bytes(b"start image")
+
+    record = sanitize_job_input(make_job_input(), {"image": str(start), "end_image": None})
+
+    dumped = json.dumps(record)
+    for raw in (PROMPT, URL, BASE64, "blurry"):
+        assert raw not in dumped
+    assert record["params"] == {"seed": 42, "lora_pairs": [{"high": "a.safetensors", "low": "b.safetensors"}]}
+    assert record["texts"]["prompt"] == {"sha256": hashlib.sha256(PROMPT.encode()).hexdigest(), "chars": len(PROMPT)}
+    assert record["sources"]["image"] == {"type": "url", "sha256": hashlib.sha256(b"start image").hexdigest(), "bytes": 11}
+    # end image was attempted but never resolved
+    assert record["sources"]["end_image"] == {"type": "base64", "resolved": False}
+    assert "error" not in record
+
+
+def test_sanitize_records_default_image_and_unattempted_inputs():
+    job_input = {"prompt": "x", "end_image_url": URL}
+
+    record = sanitize_job_input(job_input, {"image": "/example_image.png"})
+
+    assert record["sources"]["image"] == {"type": "default"}
+    # Refused before input resolution: type only, not marked as failed
+    assert record["sources"]["end_image"] == {"type": "url"}
+
+
+def test_sanitize_keeps_only_error_kind():
+    record = sanitize_job_input(make_job_input(), {"image": None}, f"URL 다운로드 실패: {URL}: 404 Not Found")
+
+    assert record["error"] == "URL 다운로드 실패"
+    assert URL not in json.dumps(record)
+
+
+def test_recorder_appends_jsonl(tmp_path):
+    path = tmp_path / "records.jsonl"
+    recorder = JobRecorder(str(path))
+
+    recorder.record(make_job_input(), {})
+    recorder.record(make_job_input(), {}, "디스크 여유 공간 부족: 출력 디렉토리 1.0GB 남음")
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r.get("error") for r in records] == [None, "디스크 여유 공간 부족"]
+
+
+def test_recorder_disabled_without_path(tmp_path):
+    recorder = JobRecorder(None)
+
+    recorder.record(make_job_input(), {})
+
+    assert not recorder.enabled
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from fake_runpod_endpoint import FakeRunPodServer, FakeEndpointConfig
+from multi_endpoint_client import MultiEndpointGenerateVideoClient
+
+
+@pytest.fixture
+def fake_server():
+    server = FakeRunPodServer({
+        "busy": FakeEndpointConfig(in_queue=20, idle=0, running=2),
+        "idle": FakeEndpointConfig(in_queue=0, idle=3, running=0),
+        "down": FakeEndpointConfig(in_queue=0, idle=5, running=0, fail_submit=True),
+    }).start()
+    yield server
+    server.stop()
+
+
+def make_client(server, endpoint_ids, **kwargs):
+    return MultiEndpointGenerateVideoClient(endpoint_ids, "test-key", api_base=server.api_base, **kwargs)
+
+
+def test_submit_job_picks_lowest_expected_start_time(fake_server):
+    client = make_client(fake_server, ["busy", "idle"])
+
+    job_id = client.submit_job({"prompt": "x"})
+
+    assert job_id.startswith("idle-")
+    assert fake_server.submissions == {"busy": 0, "idle": 1, "down": 0}
+    stats = {s["endpoint_id"]: s for s in client.get_endpoint_stats()}
+    assert stats["idle"]["expected_start_time"] < stats["busy"]["expected_start_time"]
+
+
+def test_submit_job_routes_by_queue_depth_changes(fake_server):
+    client = make_client(fake_server, ["busy", "idle"])
+    fake_server.endpoints["busy"].in_queue = 0
+    fake_server.endpoints["busy"].idle = 4
+    fake_server.endpoints["idle"].in_queue = 30
+    fake_server.endpoints["idle"].idle = 0
+    fake_server.endpoints["idle"].running = 1
+
+    assert client.submit_job({"prompt": "x"}).startswith("busy-")
+
+
+def test_submit_job_fails_over_on_run_error(fake_server):
+    # "down" has the most idle workers, so it is tried first and fails
+    client = make_client(fake_server, ["down", "busy"])
+
+    job_id = client.submit_job({"prompt": "x"})
+
+    assert job_id.startswith("busy-")
+    stats = {s["endpoint_id"]: s for s in client.get_endpoint_stats()}
+    assert stats["down"]["submit_failures"] == 1
+    assert stats["busy"]["submitted"] == 1
+
+
+def test_submit_job_returns_none_when_all_endpoints_fail(fake_server):
+    client = make_client(fake_server, ["down"])
+
+    assert client.submit_job({"prompt": "x"}) is None
+
+
+def test_failure_cooldown_skips_endpoint_until_expired(fake_server):
+    client = make_client(fake_server, ["down", "busy"], failure_cooldown=0.5)
+
+    client.submit_job({"prompt": "x"})
+    fake_server.endpoints["down"].fail_submit = False
+
+    # Still cooling down: the healthier endpoint is skipped
+    assert client.submit_job({"prompt": "x"}).startswith("busy-")
+    assert fake_server.submissions["down"] == 0
+
+    time.sleep(0.6)
+    assert client.submit_job({"prompt": "x"}).startswith("down-")
+
+
+def test_wait_for_completion_updates_record_result_averages(fake_server):
+    fake_server.endpoints["idle"].delay_time_ms = 2000
+    fake_server.endpoints["idle"].execution_time_ms = 30000
+    fake_server.endpoints["idle"].polls_until_complete = 1
+    client = make_client(fake_server, ["idle"], default_execution_time=120, smoothing=0.5)
+
+    job_id = client.submit_job({"prompt": "x"})
+    result = client.wait_for_completion(job_id, check_interval=0)
+
+    assert result["status"] == "COMPLETED"
+    assert result["endpoint_id"] == "idle"
+    stats = client.get_endpoint_stats()[0]
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["avg_delay_time"] == pytest.approx(1.0)
+    assert stats["avg_execution_time"] == pytest.approx(75.0)
@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from replay import (
+    PLACEHOLDER_IMAGE_PATH, UNRESOLVABLE_INPUTS, _percentile, build_job_input, run_replay, summarize
+)
+
+
+@pytest.mark.parametrize("percent, expected", [
+    (0, 1),
+    (50, 5),
+    (90, 9),
+    (95, 10),
+    (100, 10),
+])
+def test_percentile_uses_nearest_rank(percent, expected):
+    assert _percentile(list(range(10, 0, -1)), percent) == expected
+
+
+def test_percentile_of_empty_values_is_none():
+    assert _percentile([], 50) is None
+
+
+def make_record(**kwargs):
+    record = {
+        "params": {"seed": 1, "length": 17},
+        "texts": {"prompt": {"sha256": "p", "chars": 20}},
+        "sources": {"image": {"type": "url", "sha256": "a", "bytes": 3}},
+    }
+    record.update(kwargs)
+    return record
+
+
+def test_build_job_input_replaces_content():
+    job_input = build_job_input(make_record(), image_base64="aW1n")
+
+    assert job_input["seed"] == 1
+    assert len(job_input["prompt"]) == 20
+    assert job_input["image_base64"] == "aW1n"
+    assert "image_url" not in job_input
+    assert "end_image_base64" not in job_input
+
+
+def test_build_job_input_uses_placeholder_without_image():
+    job_input = build_job_input(make_record(sources={
+        "image": {"type": "default"},
+        "end_image": {"type": "base64", "sha256": "b"},
+    }))
+
+    assert "image_path" not in job_input
+    assert job_input["end_image_path"] == PLACEHOLDER_IMAGE_PATH
+
+
+def test_build_job_input_reproduces_unresolved_inputs():
+    job_input = build_job_input(make_record(sources={
+        "image": {"type": "url", "resolved": False},
+        "end_image": {"type": "base64", "resolved": False},
+    }, error="URL 다운로드 실패"), image_base64="aW1n")
+
+    assert job_input["image_url"] == UNRESOLVABLE_INPUTS["url"]
+    assert job_input["end_image_base64"] == UNRESOLVABLE_INPUTS["base64"]
+
+
+def test_run_replay_open_loop_measures_from_scheduled_arrival():
+    def target(job_input):
+        time.sleep(0.2)
+        return {"video": "", "metrics": {"gpu_seconds": 0.2}}
+
+    replay = run_replay([{}] * 4, target, rate=10, concurrency=1)
+
+    samples = replay["samples"]
+    assert [s["index"] for s in samples] == [0, 1, 2, 3]
+    # Arrivals every 0.1s queue behind 0.2s jobs, so waiting time is part of latency
+    assert samples[-1]["service_time"] == pytest.approx(0.2, abs=0.1)
+    assert samples[-1]["latency"] >= samples[-1]["service_time"] + 0.25
+    assert replay["wall_seconds"] >= 0.8
+
+
+def test_run_replay_closed_loop_collects_errors():
+    results = iter([{"error": "boom"}, {"status": "FAILED", "error": "oom"}, {"status": "COMPLETED", "output": {"metrics": {"gpu_seconds": 1}}}])
+
+    def target(job_input):
+        return next(results)
+
+    samples = run_replay([{}] * 3, target)["samples"]
+
+    assert [s["error"] for s in samples] == ["boom", "oom", None]
+    assert samples[2]["metrics"] == {"gpu_seconds": 1}
+    assert all(s["latency"] == pytest.approx(s["service_time"], abs=0.05) for s in samples)
+
+
+def test_summarize_counts_errors_and_cache_hits():
+    records = [
+        make_record(),
+        make_record(params={"lora_pairs": [{"high": "a"}]}),
+        make_record(sources={"image": {"type": "url", "sha256": "b"}}, error="URL 다운로드 실패"),
+        make_record(sources={}, error="디스크 여유 공간 부족"),
+    ]
+    replay = {"wall_seconds": 2.0, "samples": [
+        {"latency": 1.0, "error": None, "metrics": {"gpu_seconds": 0.5}},
+        {"latency": 3.0, "error": None, "metrics": {"gpu_seconds": 1.5}},
+        {"latency": 0.1, "error": "URL 다운로드 실패: x", "metrics": None},
+        {"latency": 0.1, "error": "URL 다운로드 실패: x", "metrics": None},
+    ]}
+
+    report = summarize(records, replay)
+
+    assert (report["jobs"], report["succeeded"], report["failed"]) == (4, 2, 2)
+    assert report["throughput_jobs_per_second"] == 1.0
+    assert report["latency_seconds"]["p50"] == 1.0
+    assert report["latency_seconds"]["max"] == 3.0
+    assert report["errors"] == {"URL 다운로드 실패: x": 2}
+    assert report["recorded_errors"] == {"URL 다운로드 실패": 1, "디스크 여유 공간 부족": 1}
+    # images a, a, b -> one repeat out of three
+    assert report["cache_hit_rates"]["input_image"] == 0.3333
+    # LoRA sets [], [a], [], [] -> two repeats out of four
+    assert report["cache_hit_rates"]["lora_set"] == 0.5
+    assert report["job_metrics"]["gpu_seconds"] == {"mean": 1.0, "p50": 0.5, "p95": 1.5}
@@ -0,0 +1,91 @@
+import os
+import time
+from collections import namedtuple
+
+import workspace
+from workspace import WorkspaceManager, GB
+
+DiskUsage = namedtuple("DiskUsage", "total used free")
+
+
+def make_file(path, size=1, age=0):
+    with open(path, 'wb') as f:
+        f.write(b'\0' * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def make_manager(tmp_path, **kwargs):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    return WorkspaceManager(tmp_path / "scratch", output_dir=output_dir, **kwargs)
+
+
+def test_reap_removes_files_older_than_max_age(tmp_path):
+    manager = make_manager(tmp_path, max_age=60)
+    old = make_file(tmp_path / "output" / "old.mp4", age=120)
+    new = make_file(tmp_path / "output" / "new.mp4", age=10)
+
+    result = manager.reap()
+
+    assert result["removed"] == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(new)
+
+
+def test_reap_evicts_oldest_first_over_size_budget(tmp_path):
+    manager = make_manager(tmp_path, max_age=3600, max_bytes=250)
+    oldest = make_file(tmp_path / "output" / "a.mp4", size=100, age=30)
+    middle = make_file(tmp_path / "output" / "b.mp4", size=100, age=20)
+    newest = make_file(tmp_path / "output" / "c.mp4", size=100, age=10)
+
+    result = manager.reap()
+
+    assert result == {"removed": 1, "freed_bytes": 100}
+    assert not os.path.exists(oldest)
+    assert os.path.exists(middle)
+    assert os.path.exists(newest)
+
+
+def test_reap_skips_active_job_dirs_and_placeholders(tmp_path):
+    manager = make_manager(tmp_path, max_age=60)
+    job_dir = manager.create_job_dir()
+    make_file(os.path.join(job_dir, "input_image.jpg"), age=120)
+    os.utime(job_dir, (time.time() - 120, time.time() - 120))
+    placeholder = make_file(tmp_path / "output" / "_output_images_will_be_put_here", age=120)
+
+    assert manager.reap()["removed"] == 0
+    assert os.path.isdir(job_dir)
+    assert os.path.exists(placeholder)
+
+    manager.release_job_dir(job_dir)
+    assert not os.path.exists(job_dir)
+
+
+def test_remove_output_deletes_metadata_png(tmp_path):
+    manager = make_manager(tmp_path)
+    video = make_file(tmp_path / "output" / "WanVideo_00001.mp4", size=10)
+    sidecar = make_file(tmp_path / "output" / "WanVideo_00001.png", size=5)
+
+    assert manager.remove_output(video) == 15
+    assert not os.path.exists(video)
+    assert not os.path.exists(sidecar)
+
+
+def test_check_free_space_uses_separate_thresholds(tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, min_free_bytes=10 * GB, scratch_min_free_bytes=1 * GB)
+    free = {manager.root: 2 * GB, manager.output_dir: 20 * GB}
+    monkeypatch.setattr(workspace.shutil, "disk_usage", lambda path: DiskUsage(0, 0, free[path]))
+
+    # 2GB tmpfs scratch is enough on its own threshold
+    assert manager.check_free_space() is None
+
+    free[manager.output_dir] = 5 * GB
+    message = manager.check_free_space()
+    assert "출력 디렉토리 5.0GB" in message
+
+    free[manager.output_dir] = 20 * GB
+    free[manager.root] = 0.5 * GB
+    message = manager.check_free_space()
+    assert "작업 디렉토리 0.5GB" in message
@@ -0,0 +1,217 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+GB = 1024 ** 3
+
+
+def _path_size(path):
+    """파일 또는 디렉토리의 전체 크기(바이트)를 반환"""
+    if os.path.isfile(path) or os.path.islink(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+def _remove_path(path):
+    """파일 또는 디렉토리를 삭제하고 삭제된 바이트 수를 반환"""
+    size = _path_size(path)
+    try:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        logger.warning(f"⚠️ 삭제 실패: {path} ({e})")
+        return 0
+    return size
+
+
+class WorkspaceManager:
+    """작업별 스크래치 디렉토리와 ComfyUI 출력 파일의 수명을 관리하는 클래스
+
+    - 작업마다 root 아래에 task_<uuid> 디렉토리를 만들고 작업이 끝나면 삭제
+    - 백그라운드 리퍼가 오래된 파일(max_age)과 용량 초과분(max_bytes)을 정리
+    - 출력 디스크 여유 공간이 min_free_bytes, 스크래치 여유 공간이 scratch_min_free_bytes
+      미만이면 작업을 시작 전에 거부 (tmpfs 스크래치는 보통 출력 디스크보다 훨씬 작음)
+    """
+
+    def __init__(
+        self,
+        root,
+        output_dir=None,
+        max_age=3600,
+        max_bytes=50 * GB,
+        min_free_bytes=10 * GB,
+        scratch_min_free_bytes=1 * GB,
+        reap_interval=300,
+    ):
+        self.root = os.path.abspath(root)
+        self.output_dir = os.path.abspath(output_dir) if output_dir else None
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.min_free_bytes = min_free_bytes
+        self.scratch_min_free_bytes = scratch_min_free_bytes
+        self.reap_interval = reap_interval
+
+        self._active = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._reaper_thread = None
+
+        os.makedirs(self.root, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수로부터 WorkspaceManager를 생성"""
+        return cls(
+            # tmpfs/NVMe 경로가 있으면 WORKSPACE_DIR로 지정
+            root=os.getenv('WORKSPACE_DIR', '/tmp/wan_workspace'),
+            output_dir=os.getenv('COMFY_OUTPUT_DIR', '/ComfyUI/output'),
+            max_age=float(os.getenv('WORKSPACE_MAX_AGE_SECONDS', 3600)),
+            max_bytes=float(os.getenv('WORKSPACE_MAX_GB', 50)) * GB,
+            min_free_bytes=float(os.getenv('WORKSPACE_MIN_FREE_GB', 10)) * GB,
+            scratch_min_free_bytes=float(os.getenv('WORKSPACE_SCRATCH_MIN_FREE_GB', 1)) * GB,
+            reap_interval=float(os.getenv('WORKSPACE_REAP_INTERVAL_SECONDS', 300)),
+        )
+
+    def low_space(self):
+        """여유 공간이 임계값 미만인 (이름, 여유 바이트, 최소 바이트) 목록을 반환"""
+        checks = [("작업 디렉토리", self.root, self.scratch_min_free_bytes)]
+        if self.output_dir and os.path.isdir(self.output_dir):
+            checks.append(("출력 디렉토리", self.output_dir, self.min_free_bytes))
+        low = []
+        for name, path, minimum in checks:
+            free = shutil.disk_usage(path).free
+            if free < minimum:
+                low.append((name, free, minimum))
+        return low
+
+    def check_free_space(self):
+        """여유 공간이 임계값 미만이면 에러 메시지를, 충분하면 None을 반환"""
+        low = self.low_space()
+        if low:
+            # 정리 가능한 파일을 먼저 치우고 한 번 더 확인
+            self.reap()
+            low = self.low_space()
+        if low:
+            message = "디스크 여유 공간 부족: " + ", ".join(
+                f"{name} {free / GB:.1f}GB 남음 (최소 {minimum / GB:.1f}GB 필요)"
+                for name, free, minimum in low
+            )
+            logger.error(f"❌ {message}")
+            return message
+        return None
+
+    def create_job_dir(self):
+        """새 작업 디렉토리를 만들고 경로를 반환"""
+        job_dir = os.path.join(self.root, f"task_{uuid.uuid4()}")
+        os.makedirs(job_dir, exist_ok=True)
+        with self._lock:
+            self._active.add(job_dir)
+        logger.info(f"📁 작업 디렉토리 생성: {job_dir}")
+        return job_dir
+
+    def release_job_dir(self, job_dir):
+        """작업 디렉토리를 삭제하고 활성 목록에서 제거"""
+        with self._lock:
+            self._active.discard(job_dir)
+        freed = _remove_path(job_dir)
+        logger.info(f"🧹 작업 디렉토리 정리: {job_dir} ({freed / (1024*1024):.1f}MB)")
+
+    def remove_output(self, file_path):
+        """ComfyUI 출력 파일과 함께 저장된 메타데이터 PNG를 삭제"""
+        freed = _remove_path(file_path)
+        sidecar = os.path.splitext(file_path)[0] + ".png"
+        if sidecar != file_path and os.path.exists(sidecar):
+            freed += _remove_path(sidecar)
+        return freed
+
+    def _candidates(self):
+        """리퍼가 정리할 수 있는 (mtime, path) 목록을 반환 (활성 작업 제외)"""
+        with self._lock:
+            active = set(self._active)
+        candidates = []
+        for base in (self.root, self.output_dir):
+            if not base or not os.path.isdir(base):
+                continue
+            for name in os.listdir(base):
+                # ComfyUI 자리표시 파일(_output_images_will_be_put_here 등)은 유지
+                if name.startswith('_'):
+                    continue
+                path = os.path.join(base, name)
+                if path in active:
+                    continue
+                try:
+                    candidates.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+        candidates.sort()
+        return candidates
+
+    def reap(self):
+        """오래된 파일과 용량 초과분을 정리하고 정리 결과를 반환"""
+        now = time.time()
+        removed = 0
+        freed = 0
+
+        remaining = []
+        for mtime, path in self._candidates():
+            if now - mtime > self.max_age:
+                freed += _remove_path(path)
+                removed += 1
+            else:
+                remaining.append((mtime, path))
+
+        # 용량 예산을 넘으면 가장 오래된 것부터 삭제
+        sizes = [(path, _path_size(path)) for _, path in remaining]
+        total = sum(size for _, size in sizes)
+        for path, size in sizes:
+            if total <= self.max_bytes:
+                break
+            freed += _remove_path(path)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info(f"🧹 리퍼 정리 완료: {removed}개 항목, {freed / (1024*1024):.1f}MB 확보")
+        return {"removed": removed, "freed_bytes": freed}
+
+    def _reaper_loop(self):
+        while not self._stop_event.wait(self.reap_interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.warning(f"⚠️ 리퍼 실행 중 오류: {e}")
+
+    def start_reaper(self):
+        """백그라운드 리퍼 스레드를 시작"""
+        if self._reaper_thread and self._reaper_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._reaper_thread = threading.Thread(target=self._reaper_loop, name="workspace-reaper", daemon=True)
+        self._reaper_thread.start()
+        logger.info(f"🧹 리퍼 시작 (주기 {self.reap_interval}s, 최대 보관 {self.max_age}s, 예산 {self.max_bytes / GB:.1f}GB)")
+
+    def stop_reaper(self):
+        """백그라운드 리퍼 스레드를 중지"""
+        self._stop_event.set()
+        if self._reaper_thread:
+            self._reaper_thread.join(timeout=5)
+            self._reaper_thread = None